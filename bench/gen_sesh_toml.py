@@ -0,0 +1,80 @@
+"""Generate a realistic synthetic sesh.toml for benchmarks.
+
+Mirrors what seshy writes (`# ---` separators, [[session]] followed by its
+[[window]] blocks) plus the noise found in hand-edited files: comments,
+sessions without windows, a [default_session] table.
+
+Usage: python bench/gen_sesh_toml.py N [--seed S] > sesh.toml
+"""
+
+import argparse
+import random
+import sys
+
+ICONS = ["💻", "🚀", "🔧", "📦", "🎯", "⚡", "🌟", "🔥", "💡", "📊"]
+
+WINDOW_SETS = [
+    [],
+    [("editor", "win-editor-git")],
+    [("editor", "win-editor-git"), ("lazygit", "win-lazygit")],
+    [
+        ("editor", "win-editor-git"),
+        ("dual", "win-split-dual"),
+        ("lazydocker", "win-lazydocker"),
+        ("lazygit", "win-lazygit"),
+    ],
+]
+
+WORDS = [
+    "api", "web", "infra", "dotfiles", "auth", "billing", "search", "feat",
+    "fix", "docs", "cli", "ui", "worker", "proxy", "data", "ml", "ops",
+]
+
+
+def session_name(i: int, rng: random.Random) -> str:
+    """Unique '<number> <words> <icon>' name; numbers repeat like real files."""
+    number = 50 + (i % 10) if rng.random() < 0.3 else i
+    words = "-".join(rng.sample(WORDS, 2))
+    return f"{number} {words}-{i} {rng.choice(ICONS)}"
+
+
+def generate(n: int, seed: int = 0) -> str:
+    """Return sesh.toml content with `n` sessions."""
+    rng = random.Random(seed)
+    out = [
+        "# sesh config (generated for benchmarks)",
+        "",
+        "[default_session]",
+        'startup_command = "nvim"',
+        "",
+    ]
+    for i in range(n):
+        name = session_name(i, rng)
+        windows = rng.choice(WINDOW_SETS)
+        if rng.random() < 0.05:
+            out.append(f"# {name} - temporary, remove after release")
+        out += ["# ---", "", "[[session]]", f'name = "{name}"']
+        out.append(f'path = "~/code/{name.split()[1]}"')
+        if windows:
+            out.append(f"windows = {[w for w, _ in windows]}".replace("'", '"'))
+        out.append("")
+        for window, script in windows:
+            out += [
+                "[[window]]",
+                f'name = "{window}"',
+                f'startup_script = "{script}"',
+                "",
+            ]
+    return "\n".join(out)
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("sessions", type=int)
+    parser.add_argument("--seed", type=int, default=0)
+    args = parser.parse_args()
+    sys.stdout.write(generate(args.sessions, args.seed))
+
+
+if __name__ == "__main__":
+    main()
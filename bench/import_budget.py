@@ -0,0 +1,104 @@
+"""Cold-start budget for `seshy list`.
+
+Runs `python -X importtime -m seshy.cli list` against a throwaway HOME and
+fails (exit 1) when either:
+
+- a module listed in `forbidden` gets imported (heavy deps must stay lazy), or
+- import time exceeds `max_import_ratio` times that of `python -X importtime
+  -c "import click"` (best of `runs` attempts each). Measuring against click
+  on the same interpreter cancels out host speed, which an absolute
+  millisecond budget can't.
+
+Budgets live in import_budget.json next to this file; raise them deliberately.
+
+Usage: python bench/import_budget.py [--update]
+"""
+
+import json
+import os
+import subprocess
+import sys
+import tempfile
+from pathlib import Path
+
+ROOT = Path(__file__).resolve().parent.parent
+BUDGET_PATH = Path(__file__).with_name("import_budget.json")
+
+SAMPLE_TOML = """\
+# ---
+
+[[session]]
+name = "51 sample 💻"
+path = "~/code/sample"
+windows = ["editor"]
+
+[[window]]
+name = "editor"
+startup_script = "win-editor-git"
+"""
+
+
+def measure(args: list[str]) -> tuple[float, set[str]]:
+    """Return (total import ms, imported module names) for one cold run.
+
+    `args` follow `python -X importtime`, e.g. ["-m", "seshy.cli", "list"].
+    """
+    with tempfile.TemporaryDirectory() as home:
+        sesh = Path(home, ".config", "sesh")
+        sesh.mkdir(parents=True)
+        (sesh / "sesh.toml").write_text(SAMPLE_TOML)
+        env = {
+            **os.environ,
+            "HOME": home,
+            "PYTHONPATH": str(ROOT / "src"),
+        }
+        # Warm the index cache and bytecode so we time the steady-state cold start
+        cmd = [sys.executable, "-X", "importtime", *args]
+        subprocess.run(cmd, env=env, capture_output=True, check=True)
+        proc = subprocess.run(cmd, env=env, capture_output=True, text=True, check=True)
+
+    total_us = 0
+    modules = set()
+    for line in proc.stderr.splitlines():
+        parts = line.removeprefix("import time:").split("|")
+        if len(parts) != 3 or not parts[0].strip().isdigit():
+            continue  # header or unrelated stderr
+        total_us += int(parts[0])
+        modules.add(parts[2].strip())
+    return total_us / 1000, modules
+
+
+def main() -> int:
+    budget = json.loads(BUDGET_PATH.read_text())
+    args = budget["command"]
+    results = [measure(["-m", "seshy.cli", *args]) for _ in range(budget["runs"])]
+    best_ms = min(ms for ms, _ in results)
+    modules = results[0][1]
+    click_ms = min(measure(["-c", "import click"])[0] for _ in range(budget["runs"]))
+    ratio = best_ms / click_ms
+
+    print(f"seshy {' '.join(args)}: {best_ms:.1f}ms import time, "
+          f"{ratio:.2f}x `import click` ({click_ms:.1f}ms; "
+          f"budget {budget['max_import_ratio']}x)")
+
+    failed = False
+    leaked = sorted(
+        m for m in modules
+        if any(m == f or m.startswith(f + ".") for f in budget["forbidden"])
+    )
+    if leaked:
+        print(f"FAIL: forbidden modules imported: {', '.join(leaked)}")
+        failed = True
+    if ratio > budget["max_import_ratio"]:
+        print("FAIL: import time over budget")
+        failed = True
+
+    if "--update" in sys.argv[1:]:
+        budget["max_import_ratio"] = round(ratio * 1.75, 1)
+        BUDGET_PATH.write_text(json.dumps(budget, indent=2) + "\n")
+        print(f"Budget updated to {budget['max_import_ratio']}x")
+        return 0
+    return 1 if failed else 0
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -0,0 +1,251 @@
+"""Benchmark seshy as sesh.toml grows.
+
+For each size, builds a throwaway HOME with a synthetic sesh.toml
+(gen_sesh_toml.py), a config.toml with a `bench` startup group, and stub
+`sesh`/`fzf`/`tmux` executables (bench/stubs/) first on PATH. Then times:
+
+- functions: in a fresh worker process per size (toml_ops, index, startup)
+- commands: end-to-end `python -m seshy.cli ...` invocations
+
+Results are written as JSON. With --baseline, every metric is compared to a
+previous run and the script exits 1 if any got slower than the tolerance.
+
+Usage:
+    python bench/run.py [--sizes 10,100,1000,10000,50000] [--repeat 5]
+                        [--latency 0.05] [--out bench/results.json]
+                        [--baseline bench/baseline.json] [--tolerance 1.25]
+"""
+
+import argparse
+import json
+import os
+import platform
+import shutil
+import statistics
+import subprocess
+import sys
+import tempfile
+import time
+from pathlib import Path
+
+BENCH_DIR = Path(__file__).resolve().parent
+ROOT = BENCH_DIR.parent
+STUBS_DIR = BENCH_DIR / "stubs"
+
+sys.path.insert(0, str(BENCH_DIR))
+from gen_sesh_toml import generate  # noqa: E402
+
+CONFIG_TOML = """\
+[groups]
+bench = ["*-[0-9] *"]
+
+[startup]
+jobs = 4
+"""
+
+# Differences below this many seconds are noise, whatever the ratio
+NOISE_FLOOR = 0.005
+
+
+def _stats(samples: list[float]) -> dict[str, float]:
+    return {"min": min(samples), "median": statistics.median(samples)}
+
+
+# --- worker (runs inside the throwaway HOME) -------------------------------
+
+
+def _time(fn, repeat: int, setup=None) -> dict[str, float]:
+    samples = []
+    for _ in range(repeat):
+        if setup:
+            setup()
+        start = time.perf_counter()
+        fn()
+        samples.append(time.perf_counter() - start)
+    return _stats(samples)
+
+
+def worker(repeat: int) -> None:
+    """Time individual functions; prints a JSON object on stdout."""
+    import contextlib
+    import io
+
+    from seshy import index, toml_ops
+    from seshy.workflows import startup as startup_workflow
+
+    original = toml_ops.SESH_TOML_PATH.read_text()
+    names = toml_ops.list_sessions()
+    last = names[-1]
+    middle = names[len(names) // 2]
+
+    def restore() -> None:
+        toml_ops.SESH_TOML_PATH.write_text(original)
+        index.load_index()
+
+    def drop_index() -> None:
+        index.INDEX_PATH.unlink(missing_ok=True)
+
+    def run_startup() -> None:
+        with contextlib.redirect_stdout(io.StringIO()), contextlib.suppress(
+            SystemExit
+        ):
+            startup_workflow.run("bench")
+
+    results = {
+        "list_sessions (cold index)": _time(
+            toml_ops.list_sessions, repeat, drop_index
+        ),
+        "list_sessions": _time(toml_ops.list_sessions, repeat),
+        "find_next_5x_number": _time(toml_ops.find_next_5x_number, repeat),
+        "get_session_line_number": _time(
+            lambda: toml_ops.get_session_line_number(last), repeat
+        ),
+        "delete_session": _time(
+            lambda: toml_ops.delete_session(middle), repeat, restore
+        ),
+        "add_session": _time(
+            lambda: toml_ops.add_session("bench", "~/code/bench", "💻", 99),
+            repeat,
+            restore,
+        ),
+        "startup_workflow.run": _time(run_startup, repeat),
+    }
+    restore()
+    json.dump(results, sys.stdout)
+
+
+# --- driver -----------------------------------------------------------------
+
+
+def make_home(size: int) -> Path:
+    home = Path(tempfile.mkdtemp(prefix=f"seshy-bench-{size}-"))
+    (home / ".config" / "sesh").mkdir(parents=True)
+    (home / ".config" / "seshy").mkdir(parents=True)
+    (home / ".config" / "sesh" / "sesh.toml").write_text(generate(size))
+    (home / ".config" / "seshy" / "config.toml").write_text(CONFIG_TOML)
+    (home / "code" / "bench-project").mkdir(parents=True)
+    return home
+
+
+def bench_env(home: Path, latency: float) -> dict[str, str]:
+    return {
+        **os.environ,
+        "HOME": str(home),
+        "PATH": f"{STUBS_DIR}{os.pathsep}{os.environ.get('PATH', '')}",
+        "PYTHONPATH": str(ROOT / "src"),
+        "SESHY_STUB_LATENCY": str(latency),
+    }
+
+
+def time_command(
+    args: list[str], env: dict, repeat: int, cwd: Path, stdin: str = "",
+    restore: Path | None = None,
+) -> dict[str, float]:
+    """Time `seshy <args>` end to end, restoring sesh.toml between runs."""
+    original = restore.read_text() if restore else None
+    samples = []
+    for _ in range(repeat):
+        start = time.perf_counter()
+        subprocess.run(
+            [sys.executable, "-m", "seshy.cli", *args],
+            env=env, cwd=cwd, input=stdin, text=True, capture_output=True,
+        )
+        samples.append(time.perf_counter() - start)
+        if restore and original is not None:
+            restore.write_text(original)
+    return _stats(samples)
+
+
+def bench_size(size: int, repeat: int, latency: float) -> dict:
+    home = make_home(size)
+    env = bench_env(home, latency)
+    sesh_toml = home / ".config" / "sesh" / "sesh.toml"
+    try:
+        proc = subprocess.run(
+            [sys.executable, __file__, "--worker", "--repeat", str(repeat)],
+            env=env, capture_output=True, text=True, check=True,
+        )
+        functions = json.loads(proc.stdout)
+
+        commands = {
+            "list": time_command(["list"], env, repeat, home),
+            "startup bench": time_command(["startup", "bench"], env, repeat, home),
+            "delete --pattern": time_command(
+                ["delete", "--pattern", "*-5 *", "--yes"], env, repeat, home,
+                restore=sesh_toml,
+            ),
+            "add -q": time_command(
+                ["add", "-q"], env, repeat, home / "code" / "bench-project",
+                stdin="y\n", restore=sesh_toml,
+            ),
+        }
+    finally:
+        shutil.rmtree(home, ignore_errors=True)
+    return {"functions": functions, "commands": commands}
+
+
+def compare(current: dict, baseline: dict, tolerance: float) -> list[str]:
+    """Return regressions (median slower than baseline * tolerance)."""
+    regressions = []
+    for size, groups in current["sizes"].items():
+        for group, metrics in groups.items():
+            for name, stats in metrics.items():
+                base = baseline.get("sizes", {}).get(size, {}).get(group, {}).get(name)
+                if not base:
+                    continue
+                now, then = stats["median"], base["median"]
+                if now > then * tolerance and now - then > NOISE_FLOOR:
+                    regressions.append(
+                        f"{size:>6} {group}/{name}: "
+                        f"{then * 1000:.1f}ms -> {now * 1000:.1f}ms ({now / then:.2f}x)"
+                    )
+    return regressions
+
+
+def main() -> int:
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("--sizes", default="10,100,1000,10000,50000")
+    parser.add_argument("--repeat", type=int, default=5)
+    parser.add_argument("--latency", type=float, default=0.05,
+                        help="Seconds each stub sesh/fzf/tmux call sleeps")
+    parser.add_argument("--out", type=Path, default=BENCH_DIR / "results.json")
+    parser.add_argument("--baseline", type=Path)
+    parser.add_argument("--tolerance", type=float, default=1.25)
+    parser.add_argument("--worker", action="store_true", help=argparse.SUPPRESS)
+    args = parser.parse_args()
+
+    if args.worker:
+        worker(args.repeat)
+        return 0
+
+    results = {
+        "python": platform.python_version(),
+        "platform": platform.platform(),
+        "latency": args.latency,
+        "sizes": {},
+    }
+    for size in (int(s) for s in args.sizes.split(",")):
+        print(f"sessions={size} ...", file=sys.stderr)
+        results["sizes"][str(size)] = bench_size(size, args.repeat, args.latency)
+        for group, metrics in results["sizes"][str(size)].items():
+            for name, stats in metrics.items():
+                print(f"  {group:<9} {name:<28} {stats['median'] * 1000:9.2f}ms",
+                      file=sys.stderr)
+
+    args.out.write_text(json.dumps(results, indent=2) + "\n")
+    print(f"Wrote {args.out}", file=sys.stderr)
+
+    if args.baseline:
+        regressions = compare(results, json.loads(args.baseline.read_text()),
+                              args.tolerance)
+        if regressions:
+            print("Regressions:", file=sys.stderr)
+            for line in regressions:
+                print(f"  {line}", file=sys.stderr)
+            return 1
+        print(f"No regressions vs {args.baseline}", file=sys.stderr)
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -0,0 +1,41 @@
+"""Best-effort JSON caches under ~/.cache/seshy/.
+
+Every cache is derived from files seshy can re-read, so these helpers never
+fail loudly: a missing, corrupt or outdated cache reads as None and a failed
+write is dropped, costing only a rebuild next time.
+
+Versioned caches store a "version" key; their owner keeps a `*_VERSION`
+constant and bumps it when the cached layout changes, so older files read
+as None instead of being misinterpreted.
+"""
+
+import json
+import os
+from pathlib import Path
+
+from .tracing import span
+
+CACHE_DIR = Path.home() / ".cache" / "seshy"
+
+
+def read_cache_json(path: Path, version: int) -> dict | None:
+    """The cached object at `path`, or None if missing/corrupt/outdated."""
+    try:
+        data = json.loads(path.read_text())
+    except (OSError, ValueError):
+        return None
+    if not isinstance(data, dict) or data.get("version") != version:
+        return None
+    return data
+
+
+def write_cache_json(path: Path, data: object) -> None:
+    """Replace `path` with `data` as JSON via temp file + rename (best effort)."""
+    tmp = path.with_name(f".{path.name}.{os.getpid()}.tmp")
+    try:
+        with span("write", path=str(path)):
+            path.parent.mkdir(parents=True, exist_ok=True)
+            tmp.write_text(json.dumps(data, ensure_ascii=False))
+            os.replace(tmp, path)
+    except OSError:
+        tmp.unlink(missing_ok=True)
@@ -1,19 +1,23 @@
-"""Seshy CLI - manage sesh.toml sessions."""
+"""Seshy CLI - manage sesh.toml sessions.
+
+Keep module-level imports to the minimum needed to dispatch: seshy runs from
+tmux key bindings, so interpreter startup is user-visible. Commands import
+workflows, fzf helpers and tomlkit-backed modules inside their bodies
+(`bench/import_budget.py` enforces this for `seshy list`).
+"""
 
 import os
 import sys
 
 import click
 
-from .fzf import fzf_select
-from .toml_ops import SESH_TOML_PATH, get_session_line_number, list_sessions
-from .workflows import add as add_workflow
-from .workflows import delete as delete_workflow
-from .workflows import startup as startup_workflow
-
 
 class AliasGroup(click.Group):
-    """Click group that displays aliases alongside commands."""
+    """Click group that displays aliases alongside commands.
+
+    Aliases are resolved when a command is looked up, so registering one
+    never requires the target command to be defined (or imported) first.
+    """
 
     def __init__(self, *args, **kwargs):
         super().__init__(*args, **kwargs)
@@ -22,17 +26,15 @@ class AliasGroup(click.Group):
     def add_alias(self, name: str, alias: str) -> None:
         """Register an alias for a command."""
         self._aliases[alias] = name
-        # Add the alias as a command that points to the original
-        cmd = self.commands.get(name)
-        if cmd:
-            self.add_command(cmd, name=alias)
-
-    def list_commands(self, ctx):
-        """Exclude aliases from command listing."""
-        return [
-            name for name in super().list_commands(ctx)
-            if name not in self._aliases
-        ]
+
+    def get_command(self, ctx, cmd_name):
+        """Resolve aliases to their canonical command on lookup."""
+        return super().get_command(ctx, self._aliases.get(cmd_name, cmd_name))
+
+    def resolve_command(self, ctx, args):
+        """Report the canonical name (not the alias) as the invoked command."""
+        _, cmd, args = super().resolve_command(ctx, args)
+        return (cmd.name if cmd else None), cmd, args
 
     def format_commands(self, ctx, formatter):
         """Format commands with aliases shown on same line."""
@@ -43,6 +45,8 @@ class AliasGroup(click.Group):
 
         for name in self.list_commands(ctx):
             cmd = self.commands[name]
+            if cmd.hidden:
+                continue
             help_text = cmd.get_short_help_str(limit=formatter.width)
             aliases = alias_map.get(name, [])
             if aliases:
@@ -57,64 +61,305 @@ class AliasGroup(click.Group):
 
 
 @click.group(cls=AliasGroup)
-def cli():
+@click.option(
+    "--profile", is_flag=True,
+    help="Print per-phase timings to stderr (SESHY_TRACE=json for JSON lines)",
+)
+def cli(profile: bool):
     """Seshy - manage sesh.toml tmux sessions."""
-    pass
+    if profile:
+        from . import tracing
+
+        if not tracing.enabled():
+            tracing.enable()
 
 
 @cli.command("add")
 @click.option("-q", "--quick", is_flag=True, help="Quick mode: auto-fill from cwd")
-def add_cmd(quick: bool):
-    """Add a new session to sesh.toml."""
-    add_workflow.run(quick)
+@click.option(
+    "-b", "--from-branch", is_flag=True, help="Branch mode: the current git branch"
+)
+@click.option("-w", "--worktrees", is_flag=True, help="One session per git worktree")
+@click.option(
+    "-B", "--branches", "pattern",
+    help="One session per local branch matching PATTERN, e.g. 'stack/*'",
+)
+@click.option("-y", "--yes", is_flag=True, help="Skip confirmation (-w/-B)")
+@click.option("-n", "--dry-run", is_flag=True, help="Only show what -w/-B would add")
+def add_cmd(
+    quick: bool,
+    from_branch: bool,
+    worktrees: bool,
+    pattern: str | None,
+    yes: bool,
+    dry_run: bool,
+):
+    """Add a new session to sesh.toml.
+
+    \b
+    -w and -B add every new worktree/branch in one write, numbered together
+    from the next 5x number; existing sessions are skipped.
+    """
+    from .workflows import add as add_workflow
+
+    if sum([quick, from_branch, worktrees, pattern is not None]) > 1:
+        click.echo("Use only one of -q, -b, -w and -B.", err=True)
+        sys.exit(1)
+    if worktrees or pattern is not None:
+        add_workflow.run_batch(worktrees, pattern, yes, dry_run)
+    else:
+        add_workflow.run(quick, from_branch)
+
+
+@cli.command("import")
+@click.argument(
+    "directory", required=False, type=click.Path(exists=True, file_okay=False)
+)
+@click.option("--stdin", "from_stdin", is_flag=True, help="Read paths from stdin")
+@click.option("-g", "--glob", "pattern", help="Glob of directories, e.g. '~/code/*'")
+@click.option("-i", "--icon", help="Icon for all new sessions")
+@click.option("--start", type=int, help="First session number")
+@click.option("-y", "--yes", is_flag=True, help="Skip confirmation")
+@click.option("-n", "--dry-run", is_flag=True, help="Only show what would be added")
+def import_cmd(
+    directory: str | None,
+    from_stdin: bool,
+    pattern: str | None,
+    icon: str | None,
+    start: int | None,
+    yes: bool,
+    dry_run: bool,
+):
+    """Create sessions for many directories in one write."""
+    from .workflows import importer as import_workflow
+
+    import_workflow.run(directory, from_stdin, pattern, icon, start, yes, dry_run)
 
 
 @cli.command("list")
-def list_cmd():
-    """List all session names."""
-    sessions = list_sessions()
+@click.option(
+    "-s", "--sort", type=click.Choice(["file", "frecency"]), default="file",
+    show_default=True, help="Order sessions as in sesh.toml or by recent use",
+)
+@click.option("-f", "--filter", "query", help="Fuzzy-match names, best first")
+@click.option("-l", "--limit", type=click.IntRange(min=1), help="Show at most N")
+@click.option("--json", "as_json", is_flag=True, help="Records as a JSON array")
+@click.option("--ndjson", is_flag=True, help="Records as one JSON object per line")
+@click.option(
+    "-F", "--format", "fmt",
+    help="Record template, e.g. '{number}\\t{name}\\t{path}'",
+)
+def list_cmd(
+    sort: str,
+    query: str | None,
+    limit: int | None,
+    as_json: bool,
+    ndjson: bool,
+    fmt: str | None,
+):
+    """List all session names (or full records for scripts).
+
+    Record fields: name, number, title, icon, path, windows, file, line,
+    end_line.
+    """
+    styles = [s for s, on in (("json", as_json), ("ndjson", ndjson),
+                              ("format", fmt is not None)) if on]
+    if len(styles) > 1:
+        click.echo("Use only one of --json, --ndjson and --format.", err=True)
+        sys.exit(1)
+
+    if query is not None:
+        from .fuzzy import search_sessions
+
+        sessions = search_sessions(query, limit, frecency=sort == "frecency")
+    else:
+        from .daemon import request
+
+        ok, sessions = request("list")
+        if not ok:
+            from .toml_ops import list_sessions
+
+            sessions = list_sessions()
+        if sort == "frecency":
+            from .usage import sort_by_frecency
+
+            sessions = sort_by_frecency(sessions)
+        sessions = sessions[:limit]
+
+    if styles:
+        from .workflows import listing
+
+        listing.run(sessions, styles[0], fmt)
+        return
     for s in sessions:
         click.echo(s)
 
 
 @cli.command()
-def read():
-    """Open sesh.toml in nvim."""
-    os.execvp("nvim", ["nvim", str(SESH_TOML_PATH)])
+@click.argument("query", nargs=-1, required=True)
+@click.option(
+    "-n", "--dry-run", is_flag=True, help="Print the best match, don't connect"
+)
+def connect(query: tuple[str, ...], dry_run: bool):
+    """Connect to the session best matching QUERY (fuzzy, no fzf needed)."""
+    from .fuzzy import search_sessions
+
+    matches = search_sessions(" ".join(query), limit=1, frecency=True)
+    if not matches:
+        click.echo(f"No session matches: {' '.join(query)}", err=True)
+        sys.exit(1)
+    name = matches[0]
+    if dry_run:
+        click.echo(name)
+        return
 
+    from .usage import record
 
-@cli.command()
-def update():
-    """Select a session and open sesh.toml at that line in nvim."""
-    sessions = list_sessions()
-    if not sessions:
-        click.echo("No sessions found.", err=True)
+    record([name], "select")
+    try:
+        os.execvp("sesh", ["sesh", "connect", name])
+    except FileNotFoundError:
+        click.echo("Error: sesh not found. Please install sesh.", err=True)
         sys.exit(1)
 
-    selected = fzf_select(sessions, "update> ")
-    if not selected:
-        click.echo("No session selected.", err=True)
-        sys.exit(1)
 
-    line = get_session_line_number(selected)
-    if line:
-        os.execvp("nvim", ["nvim", f"+{line}", str(SESH_TOML_PATH)])
+@cli.command()
+def read():
+    """Open sesh.toml (or every sesh.d/ shard) in nvim."""
+    from .shards import shard_paths
+    from .toml_ops import SESH_TOML_PATH
+
+    files = shard_paths() or [SESH_TOML_PATH]
+    os.execvp("nvim", ["nvim", *map(str, files)])
+
+
+@cli.command()
+@click.argument("session", required=False)
+def update(session: str | None):
+    """Open sesh.toml (or its shard) in nvim at a session's line.
+
+    SESSION is a full session name or a session number; without it, pick
+    one in fzf.
+    """
+    from dataclasses import asdict
+
+    from .daemon import request
+    from .fzf import fzf_select
+    from .index import find_entry
+    from .shards import locate, sync
+    from .toml_ops import list_sessions
+    from .usage import record, sort_by_frecency
+
+    if session is None:
+        ok, sessions = request("list")
+        if not ok:
+            sessions = list_sessions()
+        if not sessions:
+            click.echo("No sessions found.", err=True)
+            sys.exit(1)
+
+        session = fzf_select(sort_by_frecency(sessions), "update> ", preview=True)
+        if not session:
+            click.echo("No session selected.", err=True)
+            sys.exit(1)
+
+    if session.isdigit():
+        ok, entry = request("lookup", number=int(session))
+        found = None if ok else find_entry(number=int(session))
     else:
-        click.echo(f"Could not find line for session: {selected}", err=True)
+        ok, entry = request("lookup", name=session)
+        found = None if ok else find_entry(name=session)
+    if found is not None:
+        entry = asdict(found)
+    if entry is None:
+        click.echo(f"Could not find line for session: {session}", err=True)
         sys.exit(1)
+    record([entry["name"]], "select")
+
+    path, line = locate(entry["start_line"], sync())
+    os.execvp("nvim", ["nvim", f"+{line}", str(path)])
 
 
 @cli.command()
-def delete():
-    """Select a session and delete it (with associated windows)."""
-    delete_workflow.run()
+@click.option("-m", "--multi", is_flag=True, help="Mark several sessions in fzf")
+@click.option("-p", "--pattern", help="Delete all sessions matching a wildcard")
+@click.option("-y", "--yes", is_flag=True, help="Skip confirmation")
+def delete(multi: bool, pattern: str | None, yes: bool):
+    """Select sessions and delete them (with associated windows)."""
+    from .workflows import delete as delete_workflow
+
+    delete_workflow.run(multi, pattern, yes)
+
+
+@cli.command()
+@click.argument("old")
+@click.argument("new")
+def rename(old: str, new: str):
+    """Rename session OLD to NEW in place (windows are kept)."""
+    from .toml_ops import rename_session
+
+    if not rename_session(old, new):
+        click.echo(f"Cannot rename {old!r}: not found, or {new!r} exists", err=True)
+        sys.exit(1)
+    click.echo(f"Renamed {old} -> {new}")
 
 
 @cli.command()
 @click.argument("group", required=False)
-def startup(group: str | None):
+@click.option(
+    "-j", "--jobs", type=click.IntRange(min=1), help="Max concurrent launches"
+)
+@click.option(
+    "-t", "--timeout", type=click.FloatRange(min=0, min_open=True),
+    help="Per-session timeout in seconds",
+)
+@click.option(
+    "-b", "--build", is_flag=True,
+    help="Build windows with one tmux call per session instead of sesh connect",
+)
+def startup(
+    group: str | None, jobs: int | None, timeout: float | None, build: bool
+):
     """Launch all sessions in a named group."""
-    startup_workflow.run(group)
+    from .workflows import startup as startup_workflow
+
+    startup_workflow.run(group, jobs, timeout, build)
+
+
+@cli.command()
+@click.option(
+    "--fix", "apply_fix", is_flag=True,
+    help="Remove orphan windows and sessions whose path is gone",
+)
+@click.option("-y", "--yes", is_flag=True, help="Skip confirmation for --fix")
+@click.option("--json", "as_json", is_flag=True, help="Machine-readable report")
+def check(apply_fix: bool, yes: bool, as_json: bool):
+    """Check sesh.toml for duplicates, orphans and missing paths."""
+    from .workflows import check as check_workflow
+
+    check_workflow.run(apply_fix, yes, as_json)
+
+
+@cli.command()
+@click.argument("names", nargs=-1)
+@click.option(
+    "-r", "--resolve", is_flag=True,
+    help="Print {group: [sessions]} as JSON (for scripts)",
+)
+def groups(names: tuple[str, ...], resolve: bool):
+    """List startup groups, or resolve their members."""
+    from .workflows import groups as groups_workflow
+
+    groups_workflow.run(names, resolve)
+
+
+@cli.command()
+@click.argument("group", required=False)
+def status(group: str | None):
+    """Show which configured sessions are running in tmux."""
+    from .workflows import status as status_workflow
+
+    status_workflow.run(group)
 
 
 @cli.command()
@@ -132,7 +377,9 @@ def config(ctx):
 
     \b
     [paths]
-    base = ["~/code", ...]       # base paths for project navigation
+    base = ["~/code", ...]       # roots searched for project directories
+    depth = 3                    # how deep to look below each root
+    ignore = ["node_modules"]    # directory names never offered
 
     \b
     [[quick.windows]]            # windows added by `add -q`
@@ -142,6 +389,27 @@ def config(ctx):
     \b
     [groups]
     work = ["dotfiles*", "proj*"]  # session patterns for `startup`
+    api = ['re:^5\\d ', "@docker", "!*scratch*"]  # regex, tag, exclusion
+
+    \b
+    [tags]
+    docker = ["*api*", "*worker*"]  # named patterns usable as `@docker`
+
+    \b
+    [startup]
+    jobs = 4                     # max sessions launched concurrently
+    timeout = 30                 # seconds per `sesh connect`
+
+    \b
+    [[startup.stages]]           # launched in order, unmatched sessions last
+    sessions = ["1 dotfiles*"]   # group pattern syntax
+    ready = "pane:nvim"          # or a shell command that must exit 0
+    ready_timeout = 10           # seconds (defaults to startup.timeout)
+    wait = true                  # false: don't hold back the next stage
+
+    \b
+    [shards]                     # only with ~/.config/sesh/sesh.d/*.toml
+    default = "sessions"         # shard that new sessions are added to
     """
     from .config import CONFIG_PATH
     click.echo(f"Config: {CONFIG_PATH}")
@@ -152,6 +420,53 @@ def config(ctx):
         click.echo("No config file found. One will be created on first use.")
 
 
+@cli.command()
+@click.option("--stop", is_flag=True, help="Stop the running daemon")
+@click.option("--status", is_flag=True, help="Report whether a daemon is running")
+def daemon(stop: bool, status: bool):
+    """Run a resident daemon that serves sessions to other seshy commands.
+
+    \b
+    Runs in the foreground; start it from tmux or your shell profile, e.g.
+      tmux run-shell -b 'seshy daemon'
+    Commands fall back to in-process work when it isn't running.
+    """
+    from . import daemon as seshy_daemon
+
+    if stop or status:
+        ok, info = seshy_daemon.request("stop" if stop else "ping")
+        if not ok:
+            click.echo("No daemon running.", err=True)
+            sys.exit(1)
+        if stop:
+            click.echo("Daemon stopped.")
+        else:
+            click.echo(
+                f"Daemon running (pid {info['pid']}, {info['sessions']} sessions) "
+                f"on {seshy_daemon.SOCKET_PATH}"
+            )
+        return
+
+    try:
+        seshy_daemon.serve()
+    except RuntimeError as e:
+        click.echo(str(e), err=True)
+        sys.exit(1)
+
+
+@cli.command("check-loaders", hidden=True)
+def check_loaders():
+    """Verify the fast and formatting-preserving loaders agree."""
+    from .toml_ops import compare_loaders, list_sessions
+
+    diffs = compare_loaders()
+    if diffs:
+        for diff in diffs:
+            click.echo(diff, err=True)
+        sys.exit(1)
+    click.echo(f"OK: loaders agree on {len(list_sessions())} sessions.")
+
+
 @cli.command("shell-path")
 def shell_path():
     """Print path to shell functions for sourcing."""
@@ -168,7 +483,9 @@ cli.add_alias("list", "ls")
 cli.add_alias("read", "r")
 cli.add_alias("update", "u")
 cli.add_alias("delete", "rm")
+cli.add_alias("rename", "mv")
 cli.add_alias("startup", "s")
+cli.add_alias("connect", "c")
 
 
 def main():
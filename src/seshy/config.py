@@ -1,8 +1,16 @@
 """Seshy configuration management."""
 
+import re
+import tomllib
+from collections.abc import Mapping
+from dataclasses import dataclass
 from pathlib import Path
+from types import MappingProxyType
 
-import tomlkit
+import click
+
+from .groups import compile_patterns, compile_tags
+from .tracing import span
 
 CONFIG_PATH = Path.home() / ".config" / "seshy" / "config.toml"
 
@@ -19,12 +27,196 @@ DEFAULT_BASE_PATHS = [
 
 DEFAULT_ICON = "💻"
 
+DEFAULT_PROJECT_DEPTH = 3
+
+DEFAULT_PROJECT_IGNORE = [
+    "node_modules", "target", "dist", "build", "vendor", "__pycache__",
+]
+
+DEFAULT_STARTUP_JOBS = 4
+
+DEFAULT_STARTUP_TIMEOUT = 30.0
+
+# Shard (sesh.d/<name>.toml) that new sessions are written to
+DEFAULT_SHARD = "sessions"
+
+
+class ConfigError(click.ClickException):
+    """Raised when config.toml cannot be parsed or has invalid values."""
+
+    def __init__(self, message: str):
+        super().__init__(f"{CONFIG_PATH}: {message}")
+
+
+@dataclass(frozen=True, slots=True)
+class QuickWindow:
+    """A window added to sessions created by `add -q`."""
+
+    name: str
+    startup_script: str
+
+
+@dataclass(frozen=True, slots=True)
+class StartupStage:
+    """One [[startup.stages]] entry: sessions launched before later stages.
+
+    `ready` is an optional readiness check run after a session launches:
+    "pane:<command>" waits for a pane running <command>, anything else is a
+    shell command that must exit 0. `wait = false` lets the next stage start
+    without waiting for this one (for heavy sessions started in background).
+    """
+
+    patterns: tuple[str, ...]
+    regex: re.Pattern[str]
+    ready: str | None
+    ready_timeout: float | None
+    wait: bool
+
+
+@dataclass(frozen=True, slots=True)
+class Config:
+    """Validated, immutable view of config.toml."""
+
+    icons: tuple[str, ...]
+    default_icon: str
+    base_paths: tuple[str, ...]
+    project_depth: int
+    project_ignore: tuple[str, ...]
+    quick_windows: tuple[QuickWindow, ...]
+    groups: Mapping[str, tuple[str, ...]]
+    tags: Mapping[str, tuple[str, ...]]
+    tag_sources: Mapping[str, str]
+    group_regexes: Mapping[str, re.Pattern[str]]
+    startup_jobs: int
+    startup_timeout: float
+    startup_stages: tuple[StartupStage, ...]
+    default_shard: str
+
+    @classmethod
+    def from_dict(cls, data: dict) -> "Config":
+        """Build a Config from parsed TOML, raising ConfigError if invalid."""
+        icons = data.get("icons", {})
+        paths = data.get("paths", {})
+        quick = data.get("quick", {})
+        startup = data.get("startup", {})
+        shards = data.get("shards", {})
+
+        windows = []
+        for i, w in enumerate(quick.get("windows", [])):
+            if not isinstance(w, dict) or not {"name", "startup_script"} <= w.keys():
+                raise ConfigError(
+                    f"quick.windows[{i}] needs 'name' and 'startup_script'"
+                )
+            windows.append(QuickWindow(str(w["name"]), str(w["startup_script"])))
+
+        tags = {}
+        for name, patterns in data.get("tags", {}).items():
+            tags[name] = _str_tuple(patterns, f"tags.{name}")
+        try:
+            tag_sources = compile_tags(tags)
+        except ValueError as e:
+            raise ConfigError(str(e)) from e
+
+        groups, group_regexes = {}, {}
+        for name, patterns in data.get("groups", {}).items():
+            groups[name] = _str_tuple(patterns, f"groups.{name}")
+            try:
+                group_regexes[name] = compile_patterns(groups[name], tag_sources)
+            except ValueError as e:
+                raise ConfigError(f"groups.{name}: {e}") from e
+
+        depth = paths.get("depth", DEFAULT_PROJECT_DEPTH)
+        if not isinstance(depth, int) or isinstance(depth, bool) or depth < 0:
+            raise ConfigError("paths.depth must be a non-negative integer")
+
+        jobs = startup.get("jobs", DEFAULT_STARTUP_JOBS)
+        if not isinstance(jobs, int) or isinstance(jobs, bool) or jobs < 1:
+            raise ConfigError("startup.jobs must be a positive integer")
+        timeout = startup.get("timeout", DEFAULT_STARTUP_TIMEOUT)
+        if not isinstance(timeout, int | float) or timeout <= 0:
+            raise ConfigError("startup.timeout must be a positive number")
+
+        shard = shards.get("default", DEFAULT_SHARD)
+        if not isinstance(shard, str) or not shard or "/" in shard:
+            raise ConfigError("shards.default must be a file name without '/'")
+        shard = shard.removesuffix(".toml")
+
+        stages = []
+        for i, stage in enumerate(startup.get("stages", [])):
+            key = f"startup.stages[{i}]"
+            if not isinstance(stage, dict):
+                raise ConfigError(f"{key} must be a table")
+            stages.append(_startup_stage(stage, key, tag_sources))
+
+        return cls(
+            icons=_str_tuple(icons.get("list", DEFAULT_ICONS), "icons.list"),
+            default_icon=str(icons.get("default", DEFAULT_ICON)),
+            base_paths=_str_tuple(paths.get("base", DEFAULT_BASE_PATHS), "paths.base"),
+            project_depth=depth,
+            project_ignore=_str_tuple(
+                paths.get("ignore", DEFAULT_PROJECT_IGNORE), "paths.ignore"
+            ),
+            quick_windows=tuple(windows),
+            groups=MappingProxyType(groups),
+            tags=MappingProxyType(tags),
+            tag_sources=MappingProxyType(tag_sources),
+            group_regexes=MappingProxyType(group_regexes),
+            startup_jobs=jobs,
+            startup_timeout=float(timeout),
+            startup_stages=tuple(stages),
+            default_shard=shard,
+        )
+
+
+def _startup_stage(
+    value: Mapping[str, object], key: str, tag_sources: Mapping[str, str]
+) -> StartupStage:
+    """Validate one [[startup.stages]] table."""
+    if "sessions" not in value:
+        raise ConfigError(f"{key} needs a 'sessions' list of patterns")
+    patterns = _str_tuple(value["sessions"], f"{key}.sessions")
+    try:
+        regex = compile_patterns(patterns, tag_sources)
+    except ValueError as e:
+        raise ConfigError(f"{key}.sessions: {e}") from e
+
+    ready = value.get("ready")
+    if ready is not None and (not isinstance(ready, str) or not ready.strip()):
+        raise ConfigError(f"{key}.ready must be a non-empty string")
+    ready_timeout = value.get("ready_timeout")
+    if ready_timeout is not None and (
+        not isinstance(ready_timeout, int | float) or ready_timeout <= 0
+    ):
+        raise ConfigError(f"{key}.ready_timeout must be a positive number")
+    wait = value.get("wait", True)
+    if not isinstance(wait, bool):
+        raise ConfigError(f"{key}.wait must be true or false")
+
+    return StartupStage(
+        patterns=patterns,
+        regex=regex,
+        ready=ready,
+        ready_timeout=float(ready_timeout) if ready_timeout is not None else None,
+        wait=wait,
+    )
+
+
+def _str_tuple(value: object, key: str) -> tuple[str, ...]:
+    """Validate a list of strings from config."""
+    if isinstance(value, list):
+        items = tuple(v for v in value if isinstance(v, str))
+        if len(items) == len(value):
+            return items
+    raise ConfigError(f"{key} must be a list of strings")
+
 
 def _ensure_config() -> None:
     """Create config file with defaults if it doesn't exist."""
     if CONFIG_PATH.exists():
         return
 
+    import tomlkit
+
     CONFIG_PATH.parent.mkdir(parents=True, exist_ok=True)
 
     doc = tomlkit.document()
@@ -41,28 +233,48 @@ def _ensure_config() -> None:
     CONFIG_PATH.write_text(tomlkit.dumps(doc))
 
 
-def _load_config() -> tomlkit.TOMLDocument:
-    """Load config from file, creating with defaults if needed."""
-    _ensure_config()
-    return tomlkit.parse(CONFIG_PATH.read_text())
+def _load_config() -> Config:
+    """Load and validate config from file, creating with defaults if needed."""
+    with span("config.load", path=str(CONFIG_PATH)):
+        _ensure_config()
+        try:
+            data = tomllib.loads(CONFIG_PATH.read_text())
+        except tomllib.TOMLDecodeError as e:
+            raise ConfigError(str(e)) from e
+        return Config.from_dict(data)
+
+
+_config: Config | None = None
+
+
+def get_config() -> Config:
+    """Get the process-wide Config, loading it on first use."""
+    global _config
+    if _config is None:
+        _config = _load_config()
+    return _config
+
+
+def reload_config() -> Config:
+    """Drop the cached Config and load config.toml again."""
+    global _config
+    _config = None
+    return get_config()
 
 
 def get_icons() -> list[str]:
     """Get list of available icons."""
-    config = _load_config()
-    return list(config.get("icons", {}).get("list", DEFAULT_ICONS))
+    return list(get_config().icons)
 
 
 def get_base_paths() -> list[str]:
     """Get list of base paths for project navigation."""
-    config = _load_config()
-    return list(config.get("paths", {}).get("base", DEFAULT_BASE_PATHS))
+    return list(get_config().base_paths)
 
 
 def get_default_icon() -> str:
     """Get default icon for new sessions."""
-    config = _load_config()
-    return str(config.get("icons", {}).get("default", DEFAULT_ICON))
+    return get_config().default_icon
 
 
 def get_quick_windows() -> list[dict[str, str]]:
@@ -76,11 +288,37 @@ def get_quick_windows() -> list[dict[str, str]]:
         name = "editor"
         startup_script = "win-editor-git"
     """
-    config = _load_config()
-    return list(config.get("quick", {}).get("windows", []))
+    return [
+        {"name": w.name, "startup_script": w.startup_script}
+        for w in get_config().quick_windows
+    ]
 
 
 def get_startup_groups() -> dict[str, list[str]]:
     """Get startup groups mapping group names to session patterns."""
-    config = _load_config()
-    return dict(config.get("groups", {}))
+    return {name: list(patterns) for name, patterns in get_config().groups.items()}
+
+
+def get_group_regexes() -> Mapping[str, re.Pattern[str]]:
+    """Get each group's patterns compiled to one regex (see groups.py)."""
+    return get_config().group_regexes
+
+
+def get_startup_jobs() -> int:
+    """Get max number of sessions launched concurrently by `startup`."""
+    return get_config().startup_jobs
+
+
+def get_startup_timeout() -> float:
+    """Get per-session timeout (seconds) for `sesh connect` during `startup`."""
+    return get_config().startup_timeout
+
+
+def get_startup_stages() -> tuple[StartupStage, ...]:
+    """Get [[startup.stages]] in launch order (empty: one stage for everything)."""
+    return get_config().startup_stages
+
+
+def get_default_shard() -> str:
+    """Get the sesh.d/ shard name (without .toml) that new sessions go to."""
+    return get_config().default_shard
@@ -0,0 +1,183 @@
+"""Optional resident daemon serving session data over a Unix socket.
+
+`seshy daemon` keeps the session index, config and sesh.toml lines in
+memory and answers small JSON requests, one per line:
+
+    {"op": "list"}                    -> ["1 dotfiles 💻", ...]
+    {"op": "entries"}                 -> every index entry as a dict
+    {"op": "lookup", "name": "..."}   -> index entry dict or null
+    {"op": "lookup", "number": 52}    -> first entry with that number or null
+    {"op": "resolve", "group": "..."} -> matched session names or null
+    {"op": "preview", "name": "..."}  -> the session's sesh.toml block or null
+    {"op": "ping"} / {"op": "stop"}
+
+Every request first stats sesh.toml (regenerating it from sesh.d/ shards
+when one changed) and config.toml and reloads whatever changed, so answers
+are never staler than the files.
+
+The client half (`request`) is kept import-light: the CLI calls it before
+doing any work in-process and falls back when no daemon answers.
+"""
+
+import json
+import os
+import socket
+from pathlib import Path
+
+SOCKET_PATH = (
+    Path(os.environ.get("XDG_RUNTIME_DIR") or Path.home() / ".cache" / "seshy")
+    / "seshy.sock"
+)
+
+# Client connect/read timeout; a daemon slower than this is treated as absent
+CLIENT_TIMEOUT = 0.5
+
+
+# --- client -----------------------------------------------------------------
+
+
+def request(op: str, **args):
+    """Send one request to a running daemon.
+
+    Returns (True, result) on success, or (False, None) when no daemon is
+    reachable (or SESHY_NO_DAEMON is set) so the caller can work in-process.
+    """
+    if os.environ.get("SESHY_NO_DAEMON") or not SOCKET_PATH.exists():
+        return False, None
+    try:
+        with socket.socket(socket.AF_UNIX, socket.SOCK_STREAM) as sock:
+            sock.settimeout(CLIENT_TIMEOUT)
+            sock.connect(str(SOCKET_PATH))
+            sock.sendall(json.dumps({"op": op, **args}).encode() + b"\n")
+            with sock.makefile("rb") as f:
+                reply = json.loads(f.readline())
+    except (OSError, ValueError):
+        return False, None
+    if not reply.get("ok"):
+        return False, None
+    return True, reply.get("result")
+
+
+# --- server -----------------------------------------------------------------
+
+
+class _State:
+    """In-memory copies of the index and config, refreshed on file change."""
+
+    def __init__(self) -> None:
+        self._stamps: dict[Path, tuple[int, int] | None] = {}
+        self.entries: list = []
+        self.by_name: dict = {}
+        self.by_number: dict = {}
+        self.lines: list[str] = []
+
+    @staticmethod
+    def _stamp(path: Path) -> tuple[int, int] | None:
+        try:
+            st = path.stat()
+        except OSError:
+            return None
+        return st.st_mtime_ns, st.st_size
+
+    def _changed(self, path: Path) -> bool:
+        stamp = self._stamp(path)
+        if path in self._stamps and self._stamps[path] == stamp:
+            return False
+        self._stamps[path] = stamp
+        return True
+
+    def refresh(self) -> None:
+        from .config import CONFIG_PATH, reload_config
+        from .index import Lookup, load_index
+        from .shards import sync
+        from .toml_ops import SESH_TOML_PATH
+
+        if self._changed(CONFIG_PATH):
+            reload_config()
+        sync()
+        if self._changed(SESH_TOML_PATH):
+            self.entries = load_index()
+            lookup = Lookup.from_entries(self.entries)
+            self.by_name, self.by_number = lookup.by_name, lookup.by_number
+            self.lines = SESH_TOML_PATH.read_text().splitlines()
+
+    def handle(self, req: dict):
+        from dataclasses import asdict
+
+        from .config import get_group_regexes
+        from .groups import resolve_groups
+
+        self.refresh()
+        op = req.get("op")
+        names = [e.name for e in self.entries]
+        if op == "ping":
+            return {"pid": os.getpid(), "sessions": len(names)}
+        if op == "list":
+            return names
+        if op == "entries":
+            return [asdict(e) for e in self.entries]
+        if op == "lookup":
+            if "number" in req:
+                entry = next(iter(self.by_number.get(req["number"], [])), None)
+            else:
+                entry = self.by_name.get(req.get("name"))
+            return asdict(entry) if entry else None
+        if op == "resolve":
+            group = req.get("group")
+            if not isinstance(group, str):
+                return None
+            regex = get_group_regexes().get(group)
+            if regex is None:
+                return None
+            return resolve_groups({"": regex}, names)[""]
+        if op == "preview":
+            entry = self.by_name.get(req.get("name"))
+            if entry is None:
+                return None
+            return "\n".join(self.lines[entry.start_line - 1 : entry.end_line])
+        raise ValueError(f"unknown op: {op!r}")
+
+
+def serve() -> None:
+    """Run the daemon in the foreground until stopped."""
+    import socketserver
+    import threading
+
+    state = _State()
+    state.refresh()
+    lock = threading.Lock()
+
+    class Handler(socketserver.StreamRequestHandler):
+        def handle(self) -> None:
+            stopping = False
+            try:
+                req = json.loads(self.rfile.readline())
+                if req.get("op") == "stop":
+                    stopping = True
+                    reply = {"ok": True, "result": None}
+                else:
+                    with lock:
+                        reply = {"ok": True, "result": state.handle(req)}
+            except Exception as e:  # report, never kill the daemon
+                reply = {"ok": False, "error": f"{type(e).__name__}: {e}"}
+            self.wfile.write(json.dumps(reply, ensure_ascii=False).encode() + b"\n")
+            self.wfile.flush()
+            if stopping:
+                # Reply first: shutting down ends the process and this thread
+                threading.Thread(target=server.shutdown).start()
+
+    if SOCKET_PATH.exists():
+        alive, _ = request("ping")
+        if alive:
+            raise RuntimeError(f"daemon already running on {SOCKET_PATH}")
+        SOCKET_PATH.unlink()
+
+    SOCKET_PATH.parent.mkdir(parents=True, exist_ok=True)
+    server = socketserver.ThreadingUnixStreamServer(str(SOCKET_PATH), Handler)
+    server.daemon_threads = True
+    os.chmod(SOCKET_PATH, 0o600)
+    try:
+        server.serve_forever()
+    finally:
+        server.server_close()
+        SOCKET_PATH.unlink(missing_ok=True)
@@ -0,0 +1,250 @@
+"""Structural model of sesh.toml: sessions, owned windows and their spans.
+
+Values come from one tomllib parse; positions come from one pass over the
+lines, matching the n-th `[[session]]` / `[[window]]` header to the n-th
+parsed table. Nothing is found by searching for `name = "..."` text, so
+comments or window names that repeat a session name can't confuse it.
+
+Ownership follows the layout seshy writes: a [[window]] block belongs to the
+closest [[session]] above it when its name is in that session's `windows`
+list. Anything else is an orphan. Sessions and windows written as inline
+arrays (`session = [{...}]`) have no headers to match, so such files are
+rejected with a ClickException rather than modelled without positions.
+"""
+
+import re
+import tomllib
+from dataclasses import dataclass, field
+from pathlib import Path
+
+import click
+
+from .toml_ops import SESH_TOML_PATH, extract_number
+from .tracing import span
+
+# A table or array-of-tables header on its own line, with optional comment
+_HEADER_RE = re.compile(r"^\s*(\[\[?)\s*([^\[\]]+?)\s*\]\]?\s*(#.*)?$")
+
+
+@dataclass(frozen=True, slots=True)
+class Span:
+    """A block's position: 1-based inclusive lines, 0-based end-exclusive bytes."""
+
+    start_line: int
+    end_line: int
+    start_byte: int
+    end_byte: int
+
+
+@dataclass(frozen=True, slots=True)
+class WindowBlock:
+    """One [[window]] table."""
+
+    name: str
+    startup_script: str
+    span: Span
+
+
+@dataclass(frozen=True, slots=True)
+class SessionBlock:
+    """One [[session]] table and the [[window]] blocks it owns.
+
+    `span` covers the [[session]] table itself; `block_start` is the line of
+    its `# ---` separator (or the header when there is none). `end_line` is
+    the last line of the session or of its last owned window.
+    """
+
+    name: str
+    number: int | None
+    path: str
+    windows: tuple[str, ...]
+    span: Span
+    block_start: int
+    owned: tuple[WindowBlock, ...]
+
+    @property
+    def start_line(self) -> int:
+        return self.span.start_line
+
+    @property
+    def end_line(self) -> int:
+        return max([self.span.end_line, *(w.span.end_line for w in self.owned)])
+
+    def line_ranges(self) -> list[tuple[int, int]]:
+        """1-based inclusive line ranges to remove to delete this session."""
+        ranges = [(self.block_start, self.span.end_line)]
+        ranges.extend((w.span.start_line, w.span.end_line) for w in self.owned)
+        return ranges
+
+
+@dataclass(slots=True)
+class Document:
+    """sesh.toml as an ordered list of sessions with name/number lookups."""
+
+    lines: list[str]
+    sessions: list[SessionBlock]
+    orphans: list[WindowBlock]
+    _by_name: dict[str, SessionBlock] = field(default_factory=dict, repr=False)
+    _by_number: dict[int, list[SessionBlock]] = field(
+        default_factory=dict, repr=False
+    )
+    _shared: dict[str, str] | None = field(default=None, repr=False)
+
+    def __post_init__(self) -> None:
+        for s in self.sessions:
+            self._by_name.setdefault(s.name, s)
+            if s.number is not None:
+                self._by_number.setdefault(s.number, []).append(s)
+
+    def get(self, name: str) -> SessionBlock | None:
+        """Find a session by exact name (first one if duplicated)."""
+        return self._by_name.get(name)
+
+    def by_number(self, number: int) -> list[SessionBlock]:
+        """Find all sessions whose name starts with `number`."""
+        return self._by_number.get(number, [])
+
+    def window_scripts(self, session: SessionBlock) -> list[tuple[str, str]]:
+        """(window, startup_script) for each window a session lists.
+
+        Windows are resolved like sesh does: by name, preferring the
+        [[window]] blocks the session owns, then any other definition.
+        """
+        if self._shared is None:
+            self._shared = {}
+            for s in self.sessions:
+                for w in s.owned:
+                    self._shared.setdefault(w.name, w.startup_script)
+            for w in self.orphans:
+                self._shared.setdefault(w.name, w.startup_script)
+        owned = {w.name: w.startup_script for w in session.owned}
+        return [(w, owned.get(w, self._shared.get(w, ""))) for w in session.windows]
+
+
+def _headers(lines: list[str]) -> list[tuple[int, str, bool]]:
+    """Return (0-based line, table name, is_array) for every header line."""
+    headers = []
+    in_multiline = False
+    for i, line in enumerate(lines):
+        # Skip lines inside multi-line strings (odd number of triple quotes)
+        if line.count('"""') % 2 or line.count("'''") % 2:
+            in_multiline = not in_multiline
+            continue
+        if in_multiline:
+            continue
+        match = _HEADER_RE.match(line)
+        if match:
+            headers.append((i, match.group(2), match.group(1) == "[["))
+    return headers
+
+
+def _separator_line(lines: list[str], header: int) -> int:
+    """0-based line of the `# ---` directly above a header (or the header)."""
+    i = header
+    while i > 0 and lines[i - 1].strip() == "":
+        i -= 1
+    if i > 0 and lines[i - 1].strip() == "# ---":
+        return i - 1
+    return header
+
+
+_LAYOUT_HINT = (
+    "write sessions and windows as [[session]] / [[window]] tables, "
+    "not inline arrays like `session = [{...}]`"
+)
+
+
+def parse_document(text: str, path: Path | None = None) -> Document:
+    """Build the structural model of sesh.toml content in one pass.
+
+    Raises click.ClickException naming `path` (default sesh.toml) when the
+    text isn't valid TOML or its layout can't be mapped to lines.
+    """
+    with span("sesh_toml.parse", bytes=len(text)) as s:
+        try:
+            doc = _parse_document(text)
+        except ValueError as e:
+            raise click.ClickException(f"{path or SESH_TOML_PATH}: {e}") from e
+        s.set(sessions=len(doc.sessions))
+        return doc
+
+
+def _parse_document(text: str) -> Document:
+    data = tomllib.loads(text)
+    lines = text.splitlines()
+    raw_lines = text.splitlines(keepends=True)
+
+    offsets = [0]
+    for line in raw_lines:
+        offsets.append(offsets[-1] + len(line.encode()))
+
+    headers = _headers(lines)
+
+    def span(start: int, end: int) -> Span:
+        """Span for 0-based lines start..end (end exclusive), trimmed.
+
+        Trailing blank and comment lines belong with whatever comes next:
+        a `# ---` separator, a section comment, or the `# >>> sesh.d/...`
+        marker of the next shard in a generated sesh.toml.
+        """
+        while end > start + 1 and (
+            not lines[end - 1].strip() or lines[end - 1].lstrip().startswith("#")
+        ):
+            end -= 1
+        return Span(start + 1, end, offsets[start], offsets[end])
+
+    session_data = iter(data.get("session", []))
+    window_data = iter(data.get("window", []))
+
+    sessions: list[SessionBlock] = []
+    orphans: list[WindowBlock] = []
+    current: dict | None = None  # fields of the session being assembled
+    owned: list[WindowBlock] = []
+
+    for pos, (line_no, table, is_array) in enumerate(headers):
+        end = headers[pos + 1][0] if pos + 1 < len(headers) else len(lines)
+        if is_array and table == "window":
+            values = next(window_data, None)
+            if values is None:
+                raise ValueError(f"stray [[window]] header; {_LAYOUT_HINT}")
+            block = WindowBlock(
+                name=str(values.get("name", "")),
+                startup_script=str(values.get("startup_script", "")),
+                span=span(line_no, end),
+            )
+            if (
+                current is not None
+                and block.name in current["windows"]
+                and block.name not in {w.name for w in owned}
+            ):
+                owned.append(block)
+            else:
+                orphans.append(block)
+            continue
+
+        # Any other header ends the current session and its window ownership
+        if current is not None:
+            sessions.append(SessionBlock(**current, owned=tuple(owned)))
+        current, owned = None, []
+
+        if is_array and table == "session":
+            values = next(session_data, None)
+            if values is None:
+                raise ValueError(f"stray [[session]] header; {_LAYOUT_HINT}")
+            name = str(values.get("name", ""))
+            current = {
+                "name": name,
+                "number": extract_number(name),
+                "path": str(values.get("path", "")),
+                "windows": tuple(str(w) for w in values.get("windows", [])),
+                "span": span(line_no, end),
+                "block_start": _separator_line(lines, line_no) + 1,
+            }
+
+    if current is not None:
+        sessions.append(SessionBlock(**current, owned=tuple(owned)))
+
+    if next(session_data, None) is not None or next(window_data, None) is not None:
+        raise ValueError(f"can't locate every session and window; {_LAYOUT_HINT}")
+
+    return Document(lines=lines, sessions=sessions, orphans=orphans)
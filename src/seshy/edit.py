@@ -0,0 +1,237 @@
+"""Locked, atomic edits to sesh.toml.
+
+    with transaction() as tx:
+        tx.add("proj", "~/code/proj", "🚀", 52)
+        tx.delete("51 old 🔧")
+        tx.rename("53 api 📦", "53 api-v2 📦")
+
+Entering a transaction takes an exclusive `fcntl.flock` on a lock file next
+to sesh.toml, then reads and parses the file, so queued operations are
+checked against what is on disk now rather than what an earlier read saw.
+On a clean exit the queue is applied as line patches to the parsed spans -
+lines outside the touched blocks are kept as they are - and the result is
+written to a temp file that is fsynced and renamed over sesh.toml. An
+exception inside the block discards the queue.
+
+The lock lives in its own file because the rename replaces sesh.toml's inode.
+Both the lock and the temp file sit next to the file a symlinked sesh.toml
+(e.g. into a dotfiles repo) points at, so the link survives every write.
+"""
+
+import fcntl
+import os
+import re
+from collections.abc import Iterator
+from contextlib import contextmanager
+from pathlib import Path
+
+from .document import Document, SessionBlock, WindowBlock, parse_document
+from .toml_ops import SESH_TOML_PATH, generate_session_block
+from .tracing import span
+
+# The `name = "..."` key line of a table (basic or literal string)
+_NAME_RE = re.compile(r"""^(\s*name\s*=\s*)("(?:[^"\\]|\\.)*"|'[^']*')""")
+
+
+def _quote(value: str) -> str:
+    """TOML basic string for `value`."""
+    return '"' + value.replace("\\", "\\\\").replace('"', '\\"') + '"'
+
+
+def lock_path(path: Path) -> Path:
+    """Lock file for `path`, beside its real (symlink-resolved) location."""
+    path = path.resolve()
+    return path.with_name(f".{path.name}.lock")
+
+
+@contextmanager
+def locked(path: Path) -> Iterator[None]:
+    """Hold an exclusive advisory lock on `path` for the duration."""
+    lock = lock_path(path)
+    lock.parent.mkdir(parents=True, exist_ok=True)
+    fd = os.open(lock, os.O_RDWR | os.O_CREAT, 0o600)
+    try:
+        with span("lock", path=str(path)):
+            fcntl.flock(fd, fcntl.LOCK_EX)
+        yield
+    finally:
+        os.close(fd)  # closing the descriptor releases the lock
+
+
+def atomic_write(path: Path, text: str) -> None:
+    """Write text via an fsynced temp file + rename.
+
+    Readers see either the old or the new file, never a partial one, and the
+    new content is on disk before it replaces the old. A symlinked `path`
+    stays a symlink: the file it points to is the one replaced.
+    """
+    path = path.resolve()
+    with span("write", path=str(path), bytes=len(text)):
+        tmp = path.with_name(f".{path.name}.{os.getpid()}.tmp")
+        try:
+            mode = path.stat().st_mode & 0o777
+        except FileNotFoundError:
+            mode = 0o644
+        try:
+            with open(tmp, "w") as f:
+                f.write(text)
+                f.flush()
+                os.fsync(f.fileno())
+            os.chmod(tmp, mode)
+            os.replace(tmp, path)
+        except BaseException:
+            tmp.unlink(missing_ok=True)
+            raise
+        dir_fd = os.open(path.parent, os.O_RDONLY)
+        try:
+            os.fsync(dir_fd)
+        finally:
+            os.close(dir_fd)
+
+
+class Transaction:
+    """Queued edit operations against one locked sesh.toml.
+
+    Use through `transaction()`. Operations return False (and queue nothing)
+    when they don't apply: deleting or renaming a session that doesn't exist,
+    adding or renaming onto a name that does.
+    """
+
+    def __init__(self, path: Path) -> None:
+        self.path = path
+        self.doc = Document(lines=[], sessions=[], orphans=[])
+        self._text = ""
+        # Current session name -> its parsed block (None for queued adds)
+        self._live: dict[str, SessionBlock | None] = {}
+        self._drop: list[tuple[int, int]] = []  # 1-based inclusive ranges
+        self._replace: dict[int, str] = {}  # 1-based line -> new text
+        self._added: dict[str, list[str]] = {}  # full name -> block lines
+        self._removed: set[int] = set()  # start lines of removed sessions
+
+    def _open(self) -> None:
+        try:
+            self._text = self.path.read_text()
+        except FileNotFoundError:
+            self._text = ""
+        self.doc = parse_document(self._text, self.path)
+        for s in reversed(self.doc.sessions):
+            self._live[s.name] = s
+
+    def add(self, name: str, path: str, icon: str, number: int) -> bool:
+        """Queue appending session `{number} {name} {icon}` and its windows."""
+        full_name = f"{number} {name} {icon}"
+        if full_name in self._live:
+            return False
+        self._live[full_name] = None
+        block = generate_session_block(name, path, icon, number)
+        self._added[full_name] = block.split("\n")
+        return True
+
+    def delete(self, name: str) -> bool:
+        """Queue removing a session and the windows it owns."""
+        if name not in self._live:
+            return False
+        block = self._live.pop(name)
+        if block is None:
+            del self._added[name]
+        else:
+            self._drop.extend(block.line_ranges())
+            self._removed.add(block.start_line)
+        return True
+
+    def remove_session(self, block: SessionBlock) -> None:
+        """Queue removing one parsed [[session]] block and its windows.
+
+        Unlike `delete`, this targets the block itself, so it removes the
+        right one of several sessions sharing a name.
+        """
+        self._drop.extend(block.line_ranges())
+        self._removed.add(block.start_line)
+        if self._live.get(block.name) is block:
+            # Name lookups move on to the next same-named block, if any
+            rest = (
+                s for s in self.doc.sessions
+                if s.name == block.name and s.start_line not in self._removed
+            )
+            nxt = next(rest, None)
+            if nxt is None:
+                del self._live[block.name]
+            else:
+                self._live[block.name] = nxt
+
+    def remove_window(self, block: WindowBlock) -> None:
+        """Queue removing a [[window]] block from `self.doc` (e.g. an orphan)."""
+        self._drop.append((block.span.start_line, block.span.end_line))
+
+    def rename(self, old: str, new: str) -> bool:
+        """Queue changing a session's `name` (its windows are untouched)."""
+        if old not in self._live or new in self._live:
+            return False
+        block = self._live.pop(old)
+        self._live[new] = block
+
+        if block is None:
+            lines = self._added.pop(old)
+            self._added[new] = lines
+            i = next(i for i, line in enumerate(lines) if _NAME_RE.match(line))
+            lines[i] = _NAME_RE.sub(lambda m: m[1] + _quote(new), lines[i], 1)
+            return True
+
+        for n in range(block.span.start_line, block.span.end_line + 1):
+            line = self._replace.get(n, self.doc.lines[n - 1])
+            if _NAME_RE.match(line):
+                self._replace[n] = _NAME_RE.sub(
+                    lambda m: m[1] + _quote(new), line, 1
+                )
+                return True
+        raise ValueError(f"no name line found for session {old!r}")
+
+    def render(self) -> str:
+        """The file content with every queued operation applied."""
+        drop = set()
+        for start, end in self._drop:
+            drop.update(range(start, end + 1))
+
+        out: list[str] = []
+        gap = False  # just skipped a dropped range
+        for n, line in enumerate(self.doc.lines, 1):
+            if n in drop:
+                gap = True
+                continue
+            # Don't let a removed block leave a double blank line behind
+            if gap and not line.strip() and (not out or not out[-1].strip()):
+                continue
+            gap = False
+            out.append(self._replace.get(n, line))
+        if gap:
+            while out and not out[-1].strip():
+                out.pop()
+
+        content = "\n".join(out)
+        if out and (self._text.endswith("\n") or self._added):
+            content += "\n"
+        if self._added:
+            if out:
+                content += "\n"
+            content += "\n".join("\n".join(b) for b in self._added.values())
+        return content
+
+    @property
+    def dirty(self) -> bool:
+        return bool(self._drop or self._replace or self._added)
+
+    def commit(self) -> None:
+        """Write the queued operations (no-op when nothing is queued)."""
+        if self.dirty:
+            atomic_write(self.path, self.render())
+
+
+@contextmanager
+def transaction(path: Path | None = None) -> Iterator[Transaction]:
+    """Lock sesh.toml, yield a Transaction, and commit it on a clean exit."""
+    path = path or SESH_TOML_PATH
+    with locked(path):
+        tx = Transaction(path)
+        tx._open()
+        yield tx
+        tx.commit()
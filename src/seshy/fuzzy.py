@@ -0,0 +1,131 @@
+"""In-process fuzzy matching, for when fzf can't be used.
+
+Scoring follows fzf's spirit: every query character must appear in order
+(case-insensitively), and a match scores higher when its characters are
+consecutive or start words. Whitespace separates terms that must all match.
+
+Each candidate needs its lowercase form, a character mask (one bit per
+character, folded mod 64) to reject non-matches with one AND, and a mask of
+word-start positions. `precompute` builds these; the session index caches
+them for session names so searches don't redo it.
+"""
+
+from collections.abc import Sequence
+
+# (lowercase text, character mask, word-start position mask)
+Precomputed = tuple[str, int, int]
+
+SCORE_MATCH = 16
+BONUS_BOUNDARY = 8
+BONUS_FIRST = 10
+BONUS_CONSECUTIVE = 6
+MAX_GAP_PENALTY = 10
+
+_SEPARATORS = frozenset(" -_/.:")
+
+
+def _mask(text: str) -> int:
+    mask = 0
+    for ch in text:
+        mask |= 1 << (ord(ch) & 63)
+    return mask
+
+
+def precompute(text: str) -> Precomputed:
+    """Lowercase form, character mask and word-start mask of a candidate."""
+    lower = text.lower()
+    bounds = 0
+    prev = " "
+    for i, ch in enumerate(text):
+        if prev in _SEPARATORS or (prev.islower() and ch.isupper()):
+            bounds |= 1 << i
+        prev = ch
+    return lower, _mask(lower), bounds
+
+
+def _score_term(term: str, lower: str, bounds: int) -> int | None:
+    """Score one lowercase term against a candidate, None if it doesn't match."""
+    # Leftmost in-order occurrence...
+    end = -1
+    for ch in term:
+        end = lower.find(ch, end + 1)
+        if end < 0:
+            return None
+    # ...then walk back from its end for the tightest window
+    positions = [0] * len(term)
+    j = end
+    for k in range(len(term) - 1, -1, -1):
+        j = lower.rfind(term[k], 0, j + 1)
+        positions[k] = j
+        j -= 1
+
+    score = 0
+    prev = -2
+    for p in positions:
+        score += SCORE_MATCH
+        if p == 0:
+            score += BONUS_FIRST
+        elif bounds >> p & 1:
+            score += BONUS_BOUNDARY
+        if p == prev + 1:
+            score += BONUS_CONSECUTIVE
+        elif prev >= 0:
+            score -= min(p - prev - 1, MAX_GAP_PENALTY)
+        prev = p
+    return score
+
+
+def search(
+    query: str,
+    candidates: Sequence[str],
+    data: Sequence[Precomputed] | None = None,
+    limit: int | None = None,
+) -> list[str]:
+    """Candidates matching `query`, best first.
+
+    Ties keep the shorter candidate first, then the original order. `data`
+    is `precompute` output for each candidate, if already available.
+    """
+    terms = query.lower().split()
+    if not terms:
+        return list(candidates[:limit] if limit is not None else candidates)
+    if data is None:
+        data = [precompute(c) for c in candidates]
+    term_masks = [(t, _mask(t)) for t in terms]
+
+    scored = []
+    for i, (lower, mask, bounds) in enumerate(data):
+        total = 0
+        for term, term_mask in term_masks:
+            if term_mask & ~mask:
+                break
+            score = _score_term(term, lower, bounds)
+            if score is None:
+                break
+            total += score
+        else:
+            scored.append((-total, len(lower), i))
+
+    scored.sort()
+    if limit is not None:
+        scored = scored[:limit]
+    return [candidates[i] for _, _, i in scored]
+
+
+def search_sessions(
+    query: str, limit: int | None = None, frecency: bool = False
+) -> list[str]:
+    """Session names matching `query` using the index's cached match data.
+
+    With `frecency`, equally scored sessions are ordered by recent use.
+    """
+    from .index import load_search
+
+    names, data = load_search()
+    if frecency:
+        from .usage import sort_by_frecency
+
+        position = {name: i for i, name in enumerate(names)}
+        names = sort_by_frecency(names)
+        data = [data[position[name]] for name in names]
+    return search(query, names, data, limit)
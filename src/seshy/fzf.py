@@ -1,82 +1,211 @@
 """FZF subprocess helpers."""
 
 import os
+import shutil
 import subprocess
-from pathlib import Path
+import sys
+import threading
+from collections.abc import Iterable, Iterator, Sequence
+from contextlib import closing
+from dataclasses import dataclass, field
 
-from .config import get_base_paths, get_icons
+from .config import get_icons
+from .tracing import span
+from .utils import to_tilde
 
 
-def fzf_select(items: list[str], prompt: str = "> ") -> str | None:
-    """Generic fzf selection via subprocess."""
-    if not items:
-        return None
+@dataclass(frozen=True, slots=True)
+class FzfResult:
+    """Outcome of an accepted fzf run.
 
-    input_str = "\n".join(items)
-    try:
-        result = subprocess.run(
-            ["fzf", "--prompt", prompt],
-            input=input_str,
-            capture_output=True,
-            text=True,
-        )
-        if result.returncode == 0:
-            return result.stdout.strip()
-    except FileNotFoundError:
-        print("Error: fzf not found. Please install fzf.")
-    return None
+    `key` is the `--expect` key that accepted the selection ("" for Enter).
+    `items` holds the selected lines (several with `multi`).
+    """
 
+    key: str = ""
+    items: list[str] = field(default_factory=list)
 
-def fzf_select_icon() -> str | None:
-    """Select icon from list."""
-    return fzf_select(get_icons(), "icon> ")
+    @property
+    def item(self) -> str | None:
+        """First selected line, if any."""
+        return self.items[0] if self.items else None
 
 
-def fzf_select_base_path() -> str | None:
-    """Select from configured base paths."""
-    expanded = [os.path.expanduser(p) for p in get_base_paths()]
-    return fzf_select(expanded, "base> ")
+def _feed(stdin, items: Iterable[str]) -> None:
+    """Write items to fzf's stdin as they are produced."""
+    try:
+        if isinstance(items, Sequence):
+            # Already materialised: one write is cheaper than a flush per line
+            stdin.write("".join(f"{item}\n" for item in items))
+        else:
+            for item in items:
+                stdin.write(item + "\n")
+                stdin.flush()
+    except BrokenPipeError:
+        pass  # fzf exited (selection made or cancelled) before the source ended
+    finally:
+        close = getattr(items, "close", None)
+        if close is not None:
+            close()
+        try:
+            stdin.close()
+        except BrokenPipeError:
+            pass
 
 
-def fzf_navigate_recursive(start_path: str) -> str | None:
-    """Recursively navigate directories, select '.' to stop."""
-    current = Path(start_path).expanduser()
+def _use_fzf() -> bool:
+    """Whether fzf can run here: installed and with a terminal to draw on.
 
-    while True:
-        if not current.is_dir():
-            return str(current)
+    SESHY_PICKER=fzf or =builtin forces one picker or the other.
+    """
+    picker = os.environ.get("SESHY_PICKER", "auto")
+    if picker != "auto":
+        return picker == "fzf"
+    if shutil.which("fzf") is None:
+        return False
+    try:
+        os.close(os.open("/dev/tty", os.O_RDWR))
+    except OSError:
+        return False
+    return True
+
+
+def _builtin_select(
+    items: Iterable[str], prompt: str, multi: bool
+) -> FzfResult | None:
+    """Pick by reading a query from stdin instead of running fzf.
+
+    A single pick takes the best fuzzy match. With `multi` (delete -m) the
+    query must name sessions explicitly: an exact name or a group pattern
+    such as `feat-*` or `re:^5\\d ` - fuzzy hits are never all taken.
+    """
+    candidates = list(items)
+    sys.stderr.write(prompt)
+    sys.stderr.flush()
+    query = sys.stdin.readline().strip()
+    if not sys.stdin.isatty():
+        sys.stderr.write("\n")  # the piped query isn't echoed
+    if not query:
+        return None
+    if multi:
+        from .groups import match_sessions
 
-        # List directories + '.' option
-        items = ["."]  # Select current
         try:
-            dirs = sorted(
-                d.name for d in current.iterdir()
-                if d.is_dir() and not d.name.startswith(".")
-            )
-            items.extend(dirs)
-        except PermissionError:
-            pass
-
-        selection = fzf_select(items, f"{current}/> ")
+            matches = match_sessions([query], candidates)
+        except ValueError as e:
+            sys.stderr.write(f"Invalid pattern {query!r}: {e}\n")
+            return None
+    else:
+        from .fuzzy import search
 
-        if selection is None:
+        matches = search(query, candidates, limit=1)
+    if not matches:
+        return None
+    for match in matches:
+        sys.stderr.write(f"  → {match}\n")
+    return FzfResult(items=matches)
+
+
+def fzf_stream(
+    items: Iterable[str],
+    prompt: str = "> ",
+    multi: bool = False,
+    expect: Sequence[str] = (),
+    preview: bool = False,
+) -> FzfResult | None:
+    """Run fzf, streaming `items` to it as they are produced.
+
+    fzf appears immediately and filters while a generator source is still
+    producing. Items are written from a background thread, so the result is
+    returned as soon as fzf exits even if the source is slow; the thread
+    then closes the source on its next write.
+
+    With `preview`, items must be session names; fzf shows each one's
+    cached preview (previews.py) next to the list.
+
+    Without fzf or a terminal (scripts, plain ssh) a query is read from
+    stdin instead: fuzzy-matched for one pick, an exact name or pattern with
+    `multi`.
+
+    Returns None when cancelled or nothing matched.
+    """
+    if not _use_fzf():
+        return _builtin_select(items, prompt, multi)
+
+    args = ["fzf", "--prompt", prompt]
+    if multi:
+        args.append("--multi")
+    if expect:
+        args.append(f"--expect={','.join(expect)}")
+    if preview:
+        from . import previews
+
+        previews.ensure_previews()
+        args += previews.fzf_args()
+        items = previews.keyed_lines(list(items))
+
+    with span("subprocess.fzf", prompt=prompt) as s:
+        try:
+            proc = subprocess.Popen(
+                args, stdin=subprocess.PIPE, stdout=subprocess.PIPE, text=True
+            )
+        except FileNotFoundError:
+            print("Error: fzf not found. Please install fzf.")
             return None
-        if selection == ".":
-            return str(current)
 
-        current = current / selection
+        assert proc.stdin is not None and proc.stdout is not None
+        if isinstance(items, Sequence):
+            _feed(proc.stdin, items)
+        else:
+            threading.Thread(target=_feed, args=(proc.stdin, items)).start()
+        output = proc.stdout.read()
+        s.set(returncode=proc.wait())
+    if proc.returncode != 0:
+        return None
+
+    lines = output.splitlines()
+    key = lines.pop(0) if expect and lines else ""
+    items = [line for line in lines if line]
+    if preview:
+        items = [previews.unkey(line) for line in items]
+    return FzfResult(key=key, items=items)
 
 
-def fzf_select_path_recursive() -> str | None:
-    """Select base path then navigate recursively."""
-    base = fzf_select_base_path()
-    if base is None:
+def fzf_select(
+    items: Iterable[str], prompt: str = "> ", preview: bool = False
+) -> str | None:
+    """Generic fzf selection via subprocess (`preview` for session names)."""
+    if isinstance(items, Sequence) and not items:
         return None
 
-    result = fzf_navigate_recursive(base)
-    if result:
-        # Convert to ~ format if in home
-        home = str(Path.home())
-        if result.startswith(home):
-            result = "~" + result[len(home):]
-    return result
+    result = fzf_stream(items, prompt, preview=preview)
+    return result.item if result else None
+
+
+def fzf_select_multi(
+    items: Iterable[str], prompt: str = "> ", preview: bool = False
+) -> list[str]:
+    """fzf selection allowing several items (TAB to mark)."""
+    if isinstance(items, Sequence) and not items:
+        return []
+
+    result = fzf_stream(items, prompt, multi=True, preview=preview)
+    return result.items if result else []
+
+
+def fzf_select_icon() -> str | None:
+    """Select icon from list."""
+    return fzf_select(get_icons(), "icon> ")
+
+
+def fzf_select_project() -> str | None:
+    """Select a project directory from all base paths in one fzf (~ format)."""
+    from .projects import iter_projects
+
+    def candidates() -> Iterator[str]:
+        # Closing this generator must also close the walk so it stops
+        with closing(iter_projects()) as projects:
+            for path in projects:
+                yield to_tilde(path)
+
+    return fzf_select(candidates(), "project> ")
@@ -0,0 +1,95 @@
+"""git queries for branch-based sessions.
+
+Each function makes a single git call (plus one `rev-parse` where a
+repository root is needed) however many branches or worktrees there are.
+"""
+
+import os
+import subprocess
+from dataclasses import dataclass
+
+from .tracing import span
+
+_HEADS = "refs/heads/"
+
+
+@dataclass(frozen=True, slots=True)
+class Branch:
+    """A branch (or detached worktree) and the directory to open it in."""
+
+    name: str
+    path: str
+
+
+def _git(*args: str) -> str | None:
+    """stdout of `git <args>` in the cwd, or None if git fails or is missing."""
+    with span("subprocess.git", cmd=args[0]) as s:
+        try:
+            result = subprocess.run(["git", *args], capture_output=True, text=True)
+        except FileNotFoundError:
+            return None
+        s.set(returncode=result.returncode)
+    if result.returncode != 0:
+        return None
+    return result.stdout
+
+
+def current_branch() -> Branch | None:
+    """The checked-out branch and its worktree root.
+
+    None outside a repository or on a detached HEAD.
+    """
+    out = _git("rev-parse", "--show-toplevel", "--abbrev-ref", "HEAD")
+    if out is None:
+        return None
+    root, branch = out.splitlines()[:2]
+    if branch == "HEAD":
+        return None
+    return Branch(branch, root)
+
+
+def worktrees() -> list[Branch] | None:
+    """Every worktree of the repository, from `git worktree list --porcelain`.
+
+    Detached worktrees are named after their directory; bare entries are
+    skipped. None outside a repository.
+    """
+    out = _git("worktree", "list", "--porcelain")
+    if out is None:
+        return None
+    found = []
+    for record in out.split("\n\n"):
+        fields: dict[str, str] = {}
+        for line in record.splitlines():
+            key, _, value = line.partition(" ")
+            fields[key] = value
+        if "worktree" not in fields or "bare" in fields:
+            continue
+        path = fields["worktree"]
+        name = fields.get("branch", "").removeprefix(_HEADS)
+        found.append(Branch(name or os.path.basename(path), path))
+    return found
+
+
+def branches(pattern: str) -> list[Branch] | None:
+    """Local branches matching `pattern`, from one `git for-each-ref`.
+
+    `pattern` is matched against the name below refs/heads/ the way
+    for-each-ref does: a glob, or a prefix ending at a '/'. A branch checked
+    out in a worktree gets that worktree's path, others the current
+    worktree root. None outside a repository.
+    """
+    root = _git("rev-parse", "--show-toplevel")
+    if root is None:
+        return None
+    out = _git(
+        "for-each-ref", "--format=%(refname:short)%00%(worktreepath)",
+        _HEADS + pattern.removeprefix(_HEADS),
+    )
+    if out is None:
+        return None
+    found = []
+    for line in out.splitlines():
+        name, _, path = line.partition("\0")
+        found.append(Branch(name, path or root.strip()))
+    return found
@@ -0,0 +1,100 @@
+r"""Session group patterns, compiled to one regex per group.
+
+A group is a list of patterns matched case-insensitively against names:
+
+    "5*"            glob (fnmatch), must match the whole name
+    "re:^5\d "      regular expression, may match anywhere in the name
+    "@docker"       every session tagged `docker` in [tags]
+    "!*scratch*"    exclusion: any of the above prefixed with "!"
+
+A session is in a group when it matches an inclusion and no exclusion; a
+list with only exclusions starts from every session. Tags are named pattern
+lists in [tags] with the same syntax, except that they can't use `@tag`.
+
+Each group compiles to `(?!exclusions)(?:inclusions)`, so deciding
+membership is a single `regex.match(name)`.
+"""
+
+import fnmatch
+import re
+from collections.abc import Iterable, Mapping, Sequence
+
+
+def _alternative(pattern: str, tags: Mapping[str, str] | None) -> str:
+    """Regex source for one pattern (without its `!`)."""
+    if pattern.startswith("re:"):
+        source = pattern[3:]
+        try:
+            re.compile(source)
+        except re.error as e:
+            raise ValueError(f"bad regex {source!r}: {e}") from e
+        return f"(?:.*?(?:{source}))"
+    if pattern.startswith("@"):
+        if tags is None:
+            raise ValueError(f"{pattern!r}: tags can't refer to other tags")
+        if pattern[1:] not in tags:
+            raise ValueError(f"{pattern!r}: unknown tag")
+        return tags[pattern[1:]]
+    return fnmatch.translate(pattern)
+
+
+def _source(patterns: Sequence[str], tags: Mapping[str, str] | None) -> str:
+    include, exclude = [], []
+    for pattern in patterns:
+        if pattern.startswith("!"):
+            exclude.append(_alternative(pattern[1:], tags))
+        else:
+            include.append(_alternative(pattern, tags))
+
+    if include:
+        body = "(?:" + "|".join(include) + ")"
+    else:
+        body = "(?:.*)" if exclude else "(?!)"
+    if exclude:
+        body = "(?!" + "|".join(exclude) + ")" + body
+    return body
+
+
+def compile_tags(tags: Mapping[str, Sequence[str]]) -> dict[str, str]:
+    """Regex source per tag, for use with `compile_patterns`.
+
+    Raises ValueError naming the offending tag.
+    """
+    sources = {}
+    for name, patterns in tags.items():
+        try:
+            sources[name] = _source(patterns, None)
+        except ValueError as e:
+            raise ValueError(f"tags.{name}: {e}") from e
+    return sources
+
+
+def compile_patterns(
+    patterns: Sequence[str], tags: Mapping[str, str] | None = None
+) -> re.Pattern[str]:
+    """Compile a group's patterns into one case-insensitive regex.
+
+    `tags` comes from `compile_tags`; without it `@tag` patterns are errors.
+    """
+    return re.compile(_source(patterns, tags or {}), re.IGNORECASE | re.DOTALL)
+
+
+def resolve_groups(
+    groups: Mapping[str, re.Pattern[str]], sessions: Iterable[str]
+) -> dict[str, list[str]]:
+    """Members of every group, found in one pass over the sessions."""
+    members: dict[str, list[str]] = {name: [] for name in groups}
+    matchers = [(members[name], regex.match) for name, regex in groups.items()]
+    for session in sessions:
+        for found, match in matchers:
+            if match(session):
+                found.append(session)
+    return members
+
+
+def match_sessions(patterns: Sequence[str], sessions: Iterable[str]) -> list[str]:
+    """Sessions matching an ad-hoc pattern list (same syntax as a group)."""
+    from .config import get_config
+
+    match = compile_patterns(patterns, get_config().tag_sources).match
+    return [s for s in sessions if match(s)]
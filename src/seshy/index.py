@@ -0,0 +1,174 @@
+"""Persistent session index for sesh.toml.
+
+Parsing sesh.toml is the slowest part of read-only commands, so the parsed
+sessions are cached as JSON under ~/.cache/seshy/. The cache is
+keyed on the file's mtime and size; when those change the content hash is
+checked before falling back to a full rebuild. With sesh.d/ shards,
+sesh.toml is regenerated first if a shard changed (shards.py). A rebuild also refreshes
+the fzf preview cache (previews.py) and stores fuzzy-match data for every
+name (fuzzy.py).
+"""
+
+import hashlib
+from dataclasses import asdict, dataclass
+from typing import TYPE_CHECKING
+
+from .cache import CACHE_DIR, read_cache_json, write_cache_json
+from .document import Document, parse_document
+from .shards import sync
+from .toml_ops import SESH_TOML_PATH
+from .tracing import span
+
+if TYPE_CHECKING:
+    from .fuzzy import Precomputed
+
+INDEX_PATH = CACHE_DIR / "index.json"
+INDEX_VERSION = 4
+
+
+@dataclass(frozen=True, slots=True)
+class SessionEntry:
+    """One [[session]] from sesh.toml.
+
+    Line numbers are 1-based; `start_line` is the [[session]] header and
+    `end_line` the last line of the session or of its last owned [[window]].
+    """
+
+    name: str
+    number: int | None
+    path: str
+    windows: tuple[str, ...]
+    start_line: int
+    end_line: int
+
+
+def _entries(doc: Document) -> list[SessionEntry]:
+    return [
+        SessionEntry(
+            name=s.name,
+            number=s.number,
+            path=s.path,
+            windows=s.windows,
+            start_line=s.start_line,
+            end_line=s.end_line,
+        )
+        for s in doc.sessions
+    ]
+
+
+def _from_cache(data: dict) -> list[SessionEntry]:
+    return [
+        SessionEntry(
+            name=s["name"],
+            number=s["number"],
+            path=s["path"],
+            windows=tuple(s["windows"]),
+            start_line=s["start_line"],
+            end_line=s["end_line"],
+        )
+        for s in data["sessions"]
+    ]
+
+
+def load_index() -> list[SessionEntry]:
+    """Return the session index, rebuilding it only if sesh.toml changed."""
+    with span("index.load") as s:
+        data, status = _load_index()
+        entries = _from_cache(data)
+        s.set(cache=status, sessions=len(entries))
+        return entries
+
+
+def load_search() -> tuple[list[str], list["Precomputed"]]:
+    """Session names and their cached fuzzy-match data (see fuzzy.py)."""
+    with span("index.load", search=True) as s:
+        data, status = _load_index()
+        s.set(cache=status, sessions=len(data["sessions"]))
+    names = [e["name"] for e in data["sessions"]]
+    return names, [tuple(d) for d in data["search"]]
+
+
+def _load_index() -> tuple[dict, str]:
+    """Return (cached index data, cache status: "hit", "rehash" or "rebuild")."""
+    sync()
+    st = SESH_TOML_PATH.stat()
+    cached = read_cache_json(INDEX_PATH, INDEX_VERSION)
+    if (
+        cached
+        and cached.get("mtime_ns") == st.st_mtime_ns
+        and cached.get("size") == st.st_size
+    ):
+        return cached, "hit"
+
+    text = SESH_TOML_PATH.read_text()
+    digest = hashlib.sha256(text.encode()).hexdigest()
+    if cached and cached.get("sha256") == digest:
+        # Touched but unchanged: refresh the stamp, keep the entries
+        cached.update(mtime_ns=st.st_mtime_ns, size=st.st_size)
+        write_cache_json(INDEX_PATH, cached)
+        return cached, "rehash"
+
+    from .fuzzy import precompute
+    from .previews import write_previews
+
+    doc = parse_document(text)
+    write_previews(doc)
+    data = {
+        "version": INDEX_VERSION,
+        "mtime_ns": st.st_mtime_ns,
+        "size": st.st_size,
+        "sha256": digest,
+        "sessions": [asdict(e) for e in _entries(doc)],
+        "search": [precompute(s.name) for s in doc.sessions],
+    }
+    write_cache_json(INDEX_PATH, data)
+    return data, "rebuild"
+
+
+@dataclass(frozen=True, slots=True)
+class Lookup:
+    """Index entries by exact name and by leading number.
+
+    Duplicated names resolve to the first entry; `by_number` keeps every
+    entry with that number, in file order.
+    """
+
+    by_name: dict[str, SessionEntry]
+    by_number: dict[int, list[SessionEntry]]
+
+    @classmethod
+    def from_entries(cls, entries: list[SessionEntry]) -> "Lookup":
+        by_name: dict[str, SessionEntry] = {}
+        by_number: dict[int, list[SessionEntry]] = {}
+        for e in entries:
+            by_name.setdefault(e.name, e)
+            if e.number is not None:
+                by_number.setdefault(e.number, []).append(e)
+        return cls(by_name, by_number)
+
+
+# (sha256 of the indexed sesh.toml, its lookup), reused while content matches
+_lookup: tuple[str, Lookup] | None = None
+
+
+def load_lookup() -> Lookup:
+    """Name/number lookups over the index, built once per sesh.toml content."""
+    global _lookup
+    with span("index.load", lookup=True) as s:
+        data, status = _load_index()
+        s.set(cache=status, sessions=len(data["sessions"]))
+    if _lookup is None or _lookup[0] != data["sha256"]:
+        _lookup = (data["sha256"], Lookup.from_entries(_from_cache(data)))
+    return _lookup[1]
+
+
+def find_entry(
+    name: str | None = None, number: int | None = None
+) -> SessionEntry | None:
+    """Look up a session by exact name, or the first with a leading number."""
+    lookup = load_lookup()
+    if name is not None:
+        return lookup.by_name.get(name)
+    if number is not None:
+        return next(iter(lookup.by_number.get(number, [])), None)
+    return None
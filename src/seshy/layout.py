@@ -0,0 +1,120 @@
+"""Build a session's windows and panes with one chained tmux invocation.
+
+The `startup_script` helpers in shell/functions.sh (`win-editor-git`, ...)
+each make several tmux round trips per window once sesh has created it.
+This module knows the same layouts and emits all the tmux commands for a
+session - new-session, new-window, split-window, send-keys - as a single
+`tmux a ; b ; c` call.
+
+Unknown `startup_script` values are typed into the window, which is what
+sesh does with them.
+"""
+
+import os
+import subprocess
+
+from .tmux import tmux_name
+from .tracing import span
+
+# Layouts mirroring shell/functions.sh: (split %, commands per pane, left->right)
+LAYOUTS: dict[str, tuple[int | None, tuple[str, ...]]] = {
+    "win-editor-git": (30, ("nvim .", "git status")),
+    "win-split-dual": (50, ("", "")),
+    "win-lazygit": (None, ("lazygit",)),
+    "win-lazydocker": (None, ("lazydocker",)),
+}
+
+_PANES = ("{left}", "{right}")
+
+
+def _window_commands(target: str, script: str, cwd: str) -> list[list[str]]:
+    """tmux commands that lay out one (already created) window."""
+    if script not in LAYOUTS:
+        return [["send-keys", "-t", target, script, "Enter"]] if script else []
+
+    split, pane_cmds = LAYOUTS[script]
+    commands = []
+    if split is not None:
+        commands.append(
+            ["split-window", "-h", "-p", str(split), "-t", target, "-c", cwd]
+        )
+    panes = _PANES if split is not None else ("",)
+    for pane, cmd in zip(panes, pane_cmds, strict=False):
+        if cmd:
+            pane_target = f"{target}.{pane}" if pane else target
+            commands.append(["send-keys", "-t", pane_target, cmd, "Enter"])
+    if split is not None:
+        commands.append(["select-pane", "-t", f"{target}.{_PANES[-1]}"])
+    return commands
+
+
+def build_commands(
+    name: str, path: str, windows: list[tuple[str, str]]
+) -> list[list[str]]:
+    """All tmux commands to create session `name` with (window, script) pairs."""
+    session = tmux_name(name)
+    cwd = os.path.expanduser(path) if path else os.path.expanduser("~")
+
+    new_session = ["new-session", "-d", "-s", session, "-c", cwd]
+    if windows:
+        new_session += ["-n", windows[0][0]]
+    commands = [new_session]
+
+    for i, (window, script) in enumerate(windows):
+        target = f"={session}:{window}"
+        if i > 0:
+            commands.append(
+                ["new-window", "-t", f"={session}:", "-n", window, "-c", cwd]
+            )
+        commands.extend(_window_commands(target, script, cwd))
+
+    if windows:
+        commands.append(["select-window", "-t", f"={session}:{windows[0][0]}"])
+    return commands
+
+
+def chain(commands: list[list[str]]) -> list[str]:
+    """Join tmux commands into one argv separated by ';'."""
+    argv = ["tmux"]
+    for i, command in enumerate(commands):
+        if i:
+            argv.append(";")
+        argv.extend(command)
+    return argv
+
+
+def build_session(
+    name: str,
+    path: str,
+    windows: list[tuple[str, str]],
+    timeout: float | None = None,
+) -> bool:
+    """Create the session and all its windows in one tmux call."""
+    argv = chain(build_commands(name, path, windows))
+    with span("subprocess.tmux", cmd="build", session=name) as s:
+        try:
+            subprocess.run(argv, check=True, capture_output=True, timeout=timeout)
+            return True
+        except (
+            subprocess.CalledProcessError,
+            subprocess.TimeoutExpired,
+            FileNotFoundError,
+        ) as e:
+            s.set(failed=type(e).__name__)
+            return False
+
+
+def session_layouts(names: list[str]) -> dict[str, tuple[str, list[tuple[str, str]]]]:
+    """Look up (path, [(window, startup_script)]) for sessions in one parse."""
+    from .document import parse_document
+    from .shards import sync
+    from .toml_ops import SESH_TOML_PATH
+
+    sync()
+    doc = parse_document(SESH_TOML_PATH.read_text())
+    layouts = {}
+    for name in names:
+        session = doc.get(name)
+        if session is not None:
+            layouts[name] = (session.path, doc.window_scripts(session))
+    return layouts
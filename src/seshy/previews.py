@@ -0,0 +1,109 @@
+"""Pre-rendered fzf previews for session pickers.
+
+Whenever the session index is rebuilt, each session's summary (path,
+windows and their startup scripts, line in sesh.toml) is written to
+~/.cache/seshy/previews/<key>, where <key> is a hash of the session name.
+Pickers feed fzf `<key>\\t<tmux name>\\t<name>` lines, show only the name
+(`--with-nth`), and preview with `cat` plus one `tmux has-session` for the
+live status - no seshy process and no sesh.toml parse per cursor move.
+
+A manifest of content hashes means a rebuild only rewrites the previews
+that changed and removes those of deleted sessions.
+"""
+
+import hashlib
+import json
+import shlex
+from collections.abc import Sequence
+
+from .cache import CACHE_DIR, write_cache_json
+from .document import Document, SessionBlock
+from .tmux import tmux_name
+from .tracing import span
+
+PREVIEW_DIR = CACHE_DIR / "previews"
+MANIFEST_PATH = PREVIEW_DIR / "manifest.json"
+
+
+def preview_key(name: str) -> str:
+    """File name of a session's preview."""
+    return hashlib.sha1(name.encode()).hexdigest()[:16]
+
+
+def render(doc: Document, session: SessionBlock) -> str:
+    """The preview text for one session."""
+    lines = [session.name, "", f"path     {session.path}"]
+    windows = doc.window_scripts(session)
+    if windows:
+        width = max(len(w) for w, _ in windows)
+        for i, (window, script) in enumerate(windows):
+            label = "windows" if i == 0 else ""
+            lines.append(f"{label:<8} {window:<{width}}  {script}".rstrip())
+    else:
+        lines.append("windows  (default)")
+    lines.append(f"line     {session.start_line}")
+    return "\n".join(lines) + "\n"
+
+
+def write_previews(doc: Document) -> None:
+    """Bring the preview directory in line with `doc`.
+
+    Best effort: failures only mean missing previews until the next rebuild.
+    """
+    with span("previews.write", sessions=len(doc.sessions)) as s:
+        try:
+            old = json.loads(MANIFEST_PATH.read_text())
+        except (OSError, ValueError):
+            old = {}
+
+        new: dict[str, str] = {}
+        written = 0
+        try:
+            PREVIEW_DIR.mkdir(parents=True, exist_ok=True)
+            for session in doc.sessions:
+                key = preview_key(session.name)
+                if key in new:
+                    continue  # duplicate name: first one wins, like lookups
+                text = render(doc, session)
+                digest = hashlib.sha1(text.encode()).hexdigest()
+                new[key] = digest
+                if old.get(key) != digest:
+                    (PREVIEW_DIR / key).write_text(text)
+                    written += 1
+            for key in old.keys() - new.keys():
+                (PREVIEW_DIR / key).unlink(missing_ok=True)
+            write_cache_json(MANIFEST_PATH, new)
+        except OSError:
+            pass
+        s.set(written=written)
+
+
+def ensure_previews() -> None:
+    """Render previews if the cache was removed since the last index rebuild."""
+    if MANIFEST_PATH.exists():
+        return
+    from .document import parse_document
+    from .toml_ops import SESH_TOML_PATH
+
+    write_previews(parse_document(SESH_TOML_PATH.read_text()))
+
+
+def keyed_lines(names: Sequence[str]) -> list[str]:
+    """fzf input lines `<key>\\t<tmux name>\\t<name>` for session names."""
+    return [f"{preview_key(n)}\t{tmux_name(n)}\t{n}" for n in names]
+
+
+def unkey(line: str) -> str:
+    """Session name from a line produced by `keyed_lines`."""
+    return line.split("\t", 2)[-1]
+
+
+def fzf_args() -> list[str]:
+    """fzf options that show names only and preview from the cache."""
+    path = shlex.quote(str(PREVIEW_DIR))
+    command = (
+        f"tmux has-session -t ={{2}} 2>/dev/null"
+        " && echo '● running' || echo '○ stopped'; echo;"
+        f" cat {path}/{{1}} 2>/dev/null"
+    )
+    return ["--delimiter=\t", "--with-nth=3..", f"--preview={command}"]
@@ -0,0 +1,156 @@
+"""Project directory indexer for path selection.
+
+Walks every configured base path in parallel with `os.scandir`, yielding
+candidate directories as they are found so a single fzf can show them while
+the walk is still running. Git repositories are treated as leaves (their
+subdirectories are not offered).
+
+Each scanned directory is cached in ~/.cache/seshy/projects.json with its
+mtime; on the next walk a directory whose mtime is unchanged reuses its
+cached children instead of being listed again.
+"""
+
+import os
+import queue
+import threading
+from collections.abc import Generator
+from concurrent.futures import ThreadPoolExecutor
+
+from .cache import CACHE_DIR, read_cache_json, write_cache_json
+from .config import get_base_paths, get_config
+
+PROJECTS_CACHE_PATH = CACHE_DIR / "projects.json"
+PROJECTS_CACHE_VERSION = 1
+
+_DONE = object()
+
+
+def _load_cache(ignore: frozenset[str]) -> dict[str, dict]:
+    """Load cached directory listings made with the same ignore rules."""
+    data = read_cache_json(PROJECTS_CACHE_PATH, PROJECTS_CACHE_VERSION)
+    if data is None or data.get("ignore") != sorted(ignore):
+        return {}
+    return data.get("dirs", {})
+
+
+def _save_cache(dirs: dict[str, dict], ignore: frozenset[str]) -> None:
+    data = {"version": PROJECTS_CACHE_VERSION, "ignore": sorted(ignore), "dirs": dirs}
+    write_cache_json(PROJECTS_CACHE_PATH, data)
+
+
+def _scan_dir(path: str, ignore: frozenset[str]) -> tuple[list[str], bool]:
+    """List visible, non-ignored subdirectory names and whether path is a repo."""
+    children = []
+    is_git = False
+    try:
+        with os.scandir(path) as it:
+            for entry in it:
+                if entry.name == ".git":
+                    is_git = True
+                    continue
+                if entry.name.startswith(".") or entry.name in ignore:
+                    continue
+                try:
+                    if entry.is_dir():
+                        children.append(entry.name)
+                except OSError:
+                    continue
+    except OSError:
+        pass
+    children.sort()
+    return children, is_git
+
+
+def _walk_root(
+    root: str,
+    depth: int,
+    ignore: frozenset[str],
+    cache: dict[str, dict],
+    fresh: dict[str, dict],
+    out: queue.Queue,
+    stop: threading.Event,
+    repos_only: bool,
+) -> None:
+    """Breadth-first walk of one root, pushing each directory onto `out`."""
+    try:
+        level = [root]
+        for current_depth in range(depth + 1):
+            next_level = []
+            for path in level:
+                if stop.is_set():
+                    return
+                try:
+                    mtime = os.stat(path).st_mtime_ns
+                except OSError:
+                    continue
+                cached = cache.get(path)
+                if cached and cached["m"] == mtime:
+                    children, is_git = cached["d"], cached["g"]
+                else:
+                    children, is_git = _scan_dir(path, ignore)
+                fresh[path] = {"m": mtime, "d": children, "g": is_git}
+
+                if is_git or not repos_only:
+                    out.put(path)
+                if not is_git and current_depth < depth:
+                    next_level.extend(os.path.join(path, c) for c in children)
+            level = next_level
+    finally:
+        out.put(_DONE)
+
+
+def iter_projects(
+    roots: list[str] | None = None,
+    depth: int | None = None,
+    ignore: list[str] | None = None,
+    repos_only: bool = False,
+) -> Generator[str, None, None]:
+    """Yield candidate project directories from all roots as they are found.
+
+    With `repos_only`, only git repositories are yielded (the walk is the
+    same). Roots are walked concurrently. Closing the generator early (e.g. when
+    the user has already picked something) stops the walk and still saves
+    whatever was scanned to the cache.
+    """
+    config = get_config()
+    if roots is None:
+        roots = get_base_paths()
+    if depth is None:
+        depth = config.project_depth
+    ignore_set = frozenset(config.project_ignore if ignore is None else ignore)
+
+    expanded = list(dict.fromkeys(os.path.expanduser(r) for r in roots))
+    expanded = [r for r in expanded if os.path.isdir(r)]
+    if not expanded:
+        return
+
+    cache = _load_cache(ignore_set)
+    fresh: dict[str, dict] = {}
+    out: queue.Queue = queue.Queue()
+    stop = threading.Event()
+    seen = set()
+    completed = False
+
+    pool = ThreadPoolExecutor(max_workers=len(expanded))
+    try:
+        for root in expanded:
+            pool.submit(
+                _walk_root,
+                root, depth, ignore_set, cache, fresh, out, stop, repos_only,
+            )
+        remaining = len(expanded)
+        while remaining:
+            item = out.get()
+            if item is _DONE:
+                remaining -= 1
+            elif item not in seen:  # roots may overlap (~/code, ~/code/work)
+                seen.add(item)
+                yield item
+        completed = True
+    finally:
+        stop.set()
+        pool.shutdown(wait=True)
+        # A full walk replaces the cache (dropping removed dirs); a partial
+        # one only adds what it managed to scan
+        _save_cache(fresh if completed else {**cache, **fresh}, ignore_set)
+
@@ -0,0 +1,181 @@
+"""Sharded sesh.toml: session files under sesh.d/ merged into one sesh.toml.
+
+When ~/.config/sesh/sesh.d/ holds *.toml files, those shards are the source
+of truth and sesh.toml is generated from them, in file-name order, for sesh
+to read:
+
+    sesh.d/00-base.toml      # [default_session] etc. (plain tables once only)
+    sesh.d/personal.toml
+    sesh.d/work.toml
+
+seshy edits the shard that owns a session, or the `[shards] default` shard
+for new ones, so a change rewrites one small file. `sync` regenerates
+sesh.toml only when a shard's mtime or size differs from the manifest saved
+by the last generation (or sesh.toml itself was touched). The session index
+is still built from sesh.toml, so it stays one merged index.
+
+The manifest also records the line each shard starts at in sesh.toml, which
+`locate` uses to turn a sesh.toml line back into a shard file and line.
+"""
+
+from dataclasses import dataclass
+from pathlib import Path
+
+import click
+
+from .cache import CACHE_DIR, read_cache_json, write_cache_json
+from .toml_ops import SESH_TOML_PATH
+from .tracing import span
+
+SHARD_DIR = SESH_TOML_PATH.parent / "sesh.d"
+MANIFEST_PATH = CACHE_DIR / "shards.json"
+
+# First line of a generated sesh.toml; anything else is never overwritten
+HEADER = "# Generated by seshy from sesh.d/*.toml - edit those files, not this one."
+MANIFEST_VERSION = 1
+
+
+@dataclass(frozen=True, slots=True)
+class Shard:
+    """One shard file and where its lines start in the generated sesh.toml."""
+
+    path: Path
+    start: int  # 1-based sesh.toml line of the shard's first line
+    lines: int
+
+
+def shard_paths() -> list[Path]:
+    """Shard files in merge order (empty when sesh.d/ is missing or empty)."""
+    try:
+        return sorted(
+            p
+            for p in SHARD_DIR.iterdir()
+            if p.suffix == ".toml" and not p.name.startswith(".")
+        )
+    except OSError:
+        return []
+
+
+def _stamp(path: Path) -> list[int] | None:
+    try:
+        st = path.stat()
+    except OSError:
+        return None
+    return [st.st_mtime_ns, st.st_size]
+
+
+def _current(manifest: dict | None, paths: list[Path]) -> bool:
+    """Whether sesh.toml was generated from exactly these shard contents."""
+    if manifest is None or manifest["output"] != _stamp(SESH_TOML_PATH):
+        return False
+    recorded = [(s["name"], s["stamp"]) for s in manifest["shards"]]
+    return recorded == [(p.name, _stamp(p)) for p in paths]
+
+
+def _check_generated() -> None:
+    """Refuse to replace a sesh.toml that seshy didn't generate."""
+    try:
+        with open(SESH_TOML_PATH) as f:
+            first = f.readline().rstrip("\n")
+    except FileNotFoundError:
+        return
+    if first != HEADER:
+        raise click.ClickException(
+            f"{SESH_TOML_PATH} was not generated from {SHARD_DIR}/; move its "
+            f"contents into a shard (e.g. sesh.d/sessions.toml) first"
+        )
+
+
+def _generate(paths: list[Path]) -> dict:
+    """Write sesh.toml from the shards and return the new manifest."""
+    from .edit import atomic_write
+
+    with span("shards.generate", shards=len(paths)):
+        _check_generated()
+        out = [HEADER, ""]
+        shards = []
+        for path in paths:
+            # Stat before reading: a shard edited in between is merely
+            # regenerated again next time, never recorded as current
+            stamp = _stamp(path)
+            lines = path.read_text().splitlines()
+            out.append(f"# >>> sesh.d/{path.name}")
+            shards.append(
+                {"name": path.name, "stamp": stamp, "start": len(out) + 1,
+                 "lines": len(lines)}
+            )
+            out.extend(lines)
+            out.append("")
+        atomic_write(SESH_TOML_PATH, "\n".join(out))
+
+        manifest = {
+            "version": MANIFEST_VERSION,
+            "shards": shards,
+            "output": _stamp(SESH_TOML_PATH),
+        }
+        write_cache_json(MANIFEST_PATH, manifest)
+        return manifest
+
+
+def sync() -> list[Shard]:
+    """Regenerate sesh.toml if a shard changed; return the shard layout.
+
+    Returns [] without shards, leaving sesh.toml alone.
+    """
+    paths = shard_paths()
+    if not paths:
+        return []
+    manifest = read_cache_json(MANIFEST_PATH, MANIFEST_VERSION)
+    if not _current(manifest, paths):
+        from .edit import locked
+
+        with locked(SESH_TOML_PATH):
+            # Another process may have regenerated while we waited
+            paths = shard_paths()
+            manifest = read_cache_json(MANIFEST_PATH, MANIFEST_VERSION)
+            if not _current(manifest, paths):
+                manifest = _generate(paths)
+    assert manifest is not None
+    return [
+        Shard(SHARD_DIR / s["name"], s["start"], s["lines"])
+        for s in manifest["shards"]
+    ]
+
+
+def locate(line: int, layout: list[Shard]) -> tuple[Path, int]:
+    """The file and line that sesh.toml line `line` comes from."""
+    for shard in layout:
+        if shard.start <= line < shard.start + shard.lines:
+            return shard.path, line - shard.start + 1
+    return SESH_TOML_PATH, line
+
+
+def add_target() -> Path:
+    """File that new sessions are appended to."""
+    if not shard_paths():
+        return SESH_TOML_PATH
+    from .config import get_default_shard
+
+    return SHARD_DIR / f"{get_default_shard()}.toml"
+
+
+def owners(names: list[str]) -> dict[Path, list[str]]:
+    """Group session names by the file that defines them.
+
+    Without shards every name maps to sesh.toml; with shards, names not in
+    the index are left out.
+    """
+    layout = sync()
+    if not layout:
+        return {SESH_TOML_PATH: list(names)} if names else {}
+    from .index import load_index
+
+    starts: dict[str, int] = {}
+    for entry in load_index():
+        starts.setdefault(entry.name, entry.start_line)
+    groups: dict[Path, list[str]] = {}
+    for name in names:
+        if name in starts:
+            path, _ = locate(starts[name], layout)
+            groups.setdefault(path, []).append(name)
+    return groups
@@ -0,0 +1,55 @@
+"""tmux state queries."""
+
+import subprocess
+
+from .tracing import span
+
+
+def tmux_name(name: str) -> str:
+    """The tmux session name sesh creates for a sesh.toml session name.
+
+    tmux does not allow '.' or ':' in session names and replaces them with '_'.
+    """
+    return name.replace(".", "_").replace(":", "_")
+
+
+def live_sessions() -> set[str]:
+    """Names of running tmux sessions, from a single `tmux list-sessions` call.
+
+    Empty when tmux isn't installed or no server is running.
+    """
+    with span("subprocess.tmux", cmd="list-sessions"):
+        try:
+            result = subprocess.run(
+                ["tmux", "list-sessions", "-F", "#{session_name}"],
+                capture_output=True,
+                text=True,
+            )
+        except FileNotFoundError:
+            return set()
+    if result.returncode != 0:
+        return set()
+    return set(result.stdout.splitlines())
+
+
+def is_live(name: str, live: set[str]) -> bool:
+    """Whether a sesh.toml session is among the running tmux sessions."""
+    return tmux_name(name) in live
+
+
+def pane_commands(name: str) -> set[str]:
+    """Foreground commands of every pane in a session (empty if not running)."""
+    target = f"={tmux_name(name)}"
+    with span("subprocess.tmux", cmd="list-panes", session=name):
+        try:
+            result = subprocess.run(
+                ["tmux", "list-panes", "-s", "-t", target,
+                 "-F", "#{pane_current_command}"],
+                capture_output=True,
+                text=True,
+            )
+        except FileNotFoundError:
+            return set()
+    if result.returncode != 0:
+        return set()
+    return set(result.stdout.splitlines())
@@ -1,31 +1,42 @@
 """TOML operations for sesh.toml management."""
 
 import re
+import tomllib
 from pathlib import Path
 
-import tomlkit
-from tomlkit import TOMLDocument
-
 from .config import get_quick_windows
+from .tracing import span
 
 SESH_TOML_PATH = Path.home() / ".config" / "sesh" / "sesh.toml"
 
 
-def load_config() -> TOMLDocument:
-    """Load sesh.toml preserving formatting."""
-    return tomlkit.parse(SESH_TOML_PATH.read_text())
+def compare_loaders(text: str | None = None) -> list[str]:
+    """Check that tomllib and tomlkit see the same sessions.
+
+    Returns a list of human-readable differences; empty means they agree.
+    """
+    import tomlkit
 
+    if text is None:
+        text = SESH_TOML_PATH.read_text()
+    fast = tomllib.loads(text).get("session", [])
+    with span("sesh_toml.parse_tomlkit"):
+        slow = tomlkit.parse(text).unwrap().get("session", [])
 
-def save_config(doc: TOMLDocument) -> None:
-    """Save config back to sesh.toml."""
-    SESH_TOML_PATH.write_text(tomlkit.dumps(doc))
+    diffs = []
+    if len(fast) != len(slow):
+        diffs.append(f"session count: tomllib={len(fast)} tomlkit={len(slow)}")
+    for i, (a, b) in enumerate(zip(fast, slow, strict=False)):
+        if a != b:
+            diffs.append(f"session #{i + 1} ({b.get('name', '?')}): {a!r} != {b!r}")
+    return diffs
 
 
 def list_sessions() -> list[str]:
-    """Return list of session names."""
-    doc = load_config()
-    sessions = doc.get("session", [])
-    return [s.get("name", "") for s in sessions]
+    """Return list of session names (served from the session index)."""
+    from .index import load_index
+
+    return [e.name for e in load_index()]
 
 
 def extract_number(name: str) -> int | None:
@@ -36,6 +47,46 @@ def extract_number(name: str) -> int | None:
     return None
 
 
+def _is_icon(token: str) -> bool:
+    return not any(c.isascii() and c.isalnum() for c in token)
+
+
+def base_name(name: str) -> str:
+    """Strip the leading number and trailing icon from '52 feature-branch 🚀'."""
+    parts = name.split()
+    if parts and parts[0].isdigit():
+        parts = parts[1:]
+    if parts and _is_icon(parts[-1]):
+        parts = parts[:-1]
+    return " ".join(parts)
+
+
+def icon_of(name: str) -> str | None:
+    """The trailing icon of '52 feature-branch 🚀', if it has one."""
+    parts = name.split()
+    if len(parts) > 1 and _is_icon(parts[-1]):
+        return parts[-1]
+    return None
+
+
+def allocate_numbers(count: int, start: int | None = None) -> list[int]:
+    """Allocate `count` session numbers not already in use.
+
+    Counts up from `start` (skipping numbers taken in between), or from
+    after the highest number currently in use.
+    """
+    used = {extract_number(name) for name in list_sessions()}
+    if start is None:
+        start = max((n for n in used if n is not None), default=0) + 1
+    numbers: list[int] = []
+    n = start
+    while len(numbers) < count:
+        if n not in used:
+            numbers.append(n)
+        n += 1
+    return numbers
+
+
 def find_next_5x_number() -> int:
     """Find highest 5x number in sessions and return next."""
     sessions = list_sessions()
@@ -47,19 +98,6 @@ def find_next_5x_number() -> int:
     return max(nums, default=50) + 1
 
 
-def get_session_line_number(name: str) -> int | None:
-    """Find the line number of a session in sesh.toml."""
-    lines = SESH_TOML_PATH.read_text().splitlines()
-    for i, line in enumerate(lines, start=1):
-        if f'name = "{name}"' in line:
-            # Return the [[session]] line (usually 1-2 lines before)
-            for j in range(i - 1, max(0, i - 4), -1):
-                if "[[session]]" in lines[j - 1]:
-                    return j
-            return i
-    return None
-
-
 def generate_session_block(name: str, path: str, icon: str, number: int) -> str:
     """Generate a session block, with windows from config if configured."""
     full_name = f"{number} {name} {icon}"
@@ -92,75 +130,79 @@ def generate_session_block(name: str, path: str, icon: str, number: int) -> str:
     return "\n".join(lines)
 
 
-def add_session(name: str, path: str, icon: str, number: int) -> None:
-    """Append session + windows to sesh.toml."""
-    block = generate_session_block(name, path, icon, number)
-
-    with open(SESH_TOML_PATH, "a") as f:
-        f.write("\n" + block)
+def add_sessions(
+    sessions: list[tuple[str, str, str, int]], renumber: bool = False
+) -> list[tuple[str, str, str, int]]:
+    """Append several (name, path, icon, number) sessions in one transaction.
+
+    With sesh.d/ shards they go to the default shard (see shards.py).
+    Numbers planned before taking the lock may have been used since; with
+    `renumber` such a session moves to the next number still free under
+    the lock. A session whose full name already exists is not written.
+    Returns the sessions written, with their final numbers.
+    """
+    if not sessions:
+        return []
+    from .edit import transaction
+    from .shards import add_target, sync
+
+    added = []
+    with transaction(add_target()) as tx:
+        used = {s.number for s in tx.doc.sessions}
+        used.update(extract_number(name) for name in list_sessions())
+        for name, path, icon, number in sessions:
+            if renumber:
+                while number in used:
+                    number += 1
+            if tx.add(name, path, icon, number):
+                used.add(number)
+                added.append((name, path, icon, number))
+    sync()
+    return added
+
+
+def add_session(
+    name: str, path: str, icon: str, number: int, renumber: bool = False
+) -> int | None:
+    """Append session + windows to sesh.toml.
+
+    Returns the number it was written with, or None if it already exists.
+    """
+    added = add_sessions([(name, path, icon, number)], renumber)
+    return added[0][3] if added else None
+
+
+def delete_sessions(names: list[str]) -> list[str]:
+    """Delete several sessions and their windows, one transaction per file.
+
+    Returns the names that were found and removed.
+    """
+    from .edit import transaction
+    from .shards import owners, sync
+
+    names = list(dict.fromkeys(names))
+    removed = set()
+    for path, group in owners(names).items():
+        with transaction(path) as tx:
+            removed.update(name for name in group if tx.delete(name))
+    sync()
+    return [name for name in names if name in removed]
 
 
 def delete_session(name: str) -> bool:
     """Delete session and its associated windows from sesh.toml."""
-    content = SESH_TOML_PATH.read_text()
-    lines = content.splitlines()
-
-    # Find session block
-    session_start = None
-    session_end = None
-    windows_count = 0
-
-    # Find session by name
-    for i, line in enumerate(lines):
-        if f'name = "{name}"' in line:
-            # Go back to find [[session]]
-            for j in range(i - 1, -1, -1):
-                if "[[session]]" in lines[j]:
-                    session_start = j
-                    break
-                # Check for separator comment
-                if lines[j].strip() == "# ---":
-                    session_start = j
-                    break
-            break
-
-    if session_start is None:
-        return False
-
-    # Find how many windows this session has
-    doc = load_config()
-    for s in doc.get("session", []):
-        if s.get("name") == name:
-            windows_count = len(s.get("windows", []))
-            break
-
-    # Find end of session (next [[session]] or EOF)
-    window_count_seen = 0
-
-    for i in range(session_start + 1, len(lines)):
-        line = lines[i].strip()
-        if line == "[[session]]":
-            session_end = i
-            break
-        if line == "[[window]]":
-            window_count_seen += 1
-            if window_count_seen > windows_count:
-                session_end = i
-                break
-        # Also check for separator
-        if line == "# ---" and window_count_seen >= windows_count:
-            session_end = i
-            break
-
-    if session_end is None:
-        session_end = len(lines)
-
-    # Remove the lines
-    new_lines = lines[:session_start] + lines[session_end:]
-
-    # Clean up extra blank lines
-    new_content = "\n".join(new_lines)
-    new_content = re.sub(r"\n{3,}", "\n\n", new_content)
-
-    SESH_TOML_PATH.write_text(new_content)
-    return True
+    return bool(delete_sessions([name]))
+
+
+def rename_session(old: str, new: str) -> bool:
+    """Rename a session in place; False if `old` is missing or `new` is taken."""
+    from .edit import transaction
+    from .shards import owners, sync
+
+    path = next(iter(owners([old])), None)
+    if path is None or (path != SESH_TOML_PATH and new in list_sessions()):
+        return False  # the shard's transaction can't see other shards' names
+    with transaction(path) as tx:
+        renamed = tx.rename(old, new)
+    sync()
+    return renamed
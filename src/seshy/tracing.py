@@ -0,0 +1,125 @@
+"""Lightweight per-phase timing for seshy.
+
+Wrap a phase in `with span("name", key=value):`. Tracing is off unless
+SESHY_TRACE is set or `seshy --profile` is used; when off, `span()` returns
+a shared no-op object, so the cost is one function call and a flag check.
+
+SESHY_TRACE=json      emit one JSON object per span to stderr as it ends
+SESHY_TRACE=1         (or --profile) print a summary table to stderr at exit
+"""
+
+import atexit
+import os
+import sys
+import threading
+import time
+
+_mode: str | None = None  # None (off), "json" or "summary"
+_records: list[tuple[str, float, dict]] = []
+_started = time.perf_counter()
+
+
+class _NoopSpan:
+    __slots__ = ()
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, *exc):
+        return False
+
+    def set(self, **attrs) -> None:
+        pass
+
+
+_NOOP = _NoopSpan()
+
+
+class _Span:
+    __slots__ = ("name", "attrs", "start")
+
+    def __init__(self, name: str, attrs: dict):
+        self.name = name
+        self.attrs = attrs
+        self.start = 0.0
+
+    def __enter__(self):
+        self.start = time.perf_counter()
+        return self
+
+    def __exit__(self, exc_type, *exc):
+        elapsed = time.perf_counter() - self.start
+        if exc_type is not None:
+            self.attrs["error"] = exc_type.__name__
+        _record(self.name, self.start, elapsed, self.attrs)
+        return False
+
+    def set(self, **attrs) -> None:
+        """Attach attributes discovered while the span is running."""
+        self.attrs.update(attrs)
+
+
+def span(name: str, **attrs) -> _Span | _NoopSpan:
+    """Time a phase; a no-op unless tracing is enabled."""
+    if _mode is None:
+        return _NOOP
+    return _Span(name, attrs)
+
+
+def enabled() -> bool:
+    return _mode is not None
+
+
+def enable(mode: str = "summary") -> None:
+    """Turn tracing on for the rest of the process."""
+    global _mode
+    if _mode is None:
+        atexit.register(_report)
+    _mode = mode
+
+
+def _record(name: str, start: float, elapsed: float, attrs: dict) -> None:
+    if _mode == "json":
+        import json
+
+        line = json.dumps(
+            {
+                "span": name,
+                "start_ms": round((start - _started) * 1000, 3),
+                "ms": round(elapsed * 1000, 3),
+                "thread": threading.current_thread().name,
+                **attrs,
+            },
+            ensure_ascii=False,
+            default=str,
+        )
+        print(line, file=sys.stderr, flush=True)
+    else:
+        _records.append((name, elapsed, attrs))
+
+
+def _report() -> None:
+    """Print per-span totals (summary mode) at interpreter exit."""
+    if _mode != "summary" or not _records:
+        return
+    totals: dict[str, list[float]] = {}
+    for name, elapsed, _ in _records:
+        totals.setdefault(name, []).append(elapsed)
+
+    width = max(len(name) for name in totals)
+    out = sys.stderr
+    header = f"{'span':<{width}}  {'count':>5}  {'total ms':>9}  {'max ms':>8}"
+    print(f"\n{header}", file=out)
+    for name, times in sorted(totals.items(), key=lambda kv: -sum(kv[1])):
+        print(
+            f"{name:<{width}}  {len(times):>5}  {sum(times) * 1000:>9.2f}"
+            f"  {max(times) * 1000:>8.2f}",
+            file=out,
+        )
+    wall = (time.perf_counter() - _started) * 1000
+    print(f"{'wall (since import)':<{width}}  {'':>5}  {wall:>9.2f}", file=out)
+
+
+_env = os.environ.get("SESHY_TRACE", "")
+if _env and _env != "0":
+    enable("json" if _env.lower() == "json" else "summary")
@@ -1,5 +1,7 @@
 """User interaction functions (prompts, display)."""
 
+import click
+
 from .toml_ops import generate_session_block
 
 
@@ -12,3 +14,19 @@ def confirm(prompt: str = "Proceed?") -> bool:
 def preview_session(name: str, path: str, icon: str, number: int) -> str:
     """Generate preview of session to be added."""
     return generate_session_block(name, path, icon, number)
+
+
+def report_added(
+    planned: list[tuple[str, str, str, int]],
+    added: list[tuple[str, str, str, int]],
+    verb: str = "Added",
+) -> None:
+    """Summarize an add_sessions() call against the plan shown before it."""
+    final = {(name, path): number for name, path, _, number in added}
+    for name, path, icon, number in planned:
+        new = final.get((name, path))
+        if new is None:
+            click.echo(f"  ! {number} {name} {icon} already exists", err=True)
+        elif new != number:
+            click.echo(f"  ~ {new} {name} {icon}  (number {number} was taken)")
+    click.echo(f"{verb} {len(added)} sessions.")
@@ -0,0 +1,170 @@
+"""Session usage log and a precomputed frecency ordering.
+
+Launches and picker selections are appended to ~/.cache/seshy/usage.jsonl,
+one JSON object per line: {"t": unix time, "s": session, "e": event}. An
+event is worth WEIGHTS[event] when it happens and halves every HALF_LIFE
+seconds, so a session's frecency is sum(w * 2 ** ((t - now) / HALF_LIFE)).
+
+All scores decay at the same rate, so the ranking only changes when an
+event is added. Scores are kept relative to a fixed reference time in
+frecency.json next to the session index, together with the sorted order
+and how much of the log they cover; a query reads the order and only
+folds in log lines appended since.
+
+Past COMPACT_LINES lines, the log is rewritten as one {"t", "s", "w"} line
+per session carrying its accumulated weight.
+"""
+
+import json
+import os
+import time
+from collections.abc import Iterable
+
+from .cache import CACHE_DIR, read_cache_json, write_cache_json
+
+USAGE_LOG = CACHE_DIR / "usage.jsonl"
+FRECENCY_PATH = CACHE_DIR / "frecency.json"
+
+FRECENCY_VERSION = 1
+
+HALF_LIFE = 7 * 24 * 3600
+WEIGHTS = {"select": 1.0, "launch": 0.5}
+COMPACT_LINES = 2000
+# Sessions whose weight decayed below this are dropped at compaction
+MIN_WEIGHT = 0.01
+
+
+def _empty() -> dict:
+    return {
+        "version": FRECENCY_VERSION,
+        "ino": None,
+        "offset": 0,
+        "lines": 0,
+        "ref": None,
+        "scores": {},
+        "order": [],
+    }
+
+
+# Field types a cache read from disk must have; anything else is rebuilt
+_FIELDS = {
+    "ino": (int, type(None)),
+    "offset": int,
+    "lines": int,
+    "ref": (int, float, type(None)),
+    "scores": dict,
+    "order": list,
+}
+
+
+def _load() -> dict:
+    """The frecency cache, or an empty one if missing, outdated or malformed."""
+    cache = read_cache_json(FRECENCY_PATH, FRECENCY_VERSION)
+    if cache is None:
+        return _empty()
+    if not all(isinstance(cache.get(k), t) for k, t in _FIELDS.items()):
+        return _empty()
+    return cache
+
+
+def _refresh() -> dict:
+    """Fold log lines the cache hasn't seen into it; return the cache."""
+    try:
+        return _fold(_load())
+    except (KeyError, TypeError):
+        # Bad values inside a well-formed cache: fold the whole log afresh
+        return _fold(_empty())
+
+
+def _fold(cache: dict) -> dict:
+    try:
+        st = USAGE_LOG.stat()
+    except FileNotFoundError:
+        return cache
+    if cache["ino"] != st.st_ino or st.st_size < cache["offset"]:
+        cache = _empty()  # log was compacted or replaced: start over
+    if st.st_size == cache["offset"]:
+        return cache
+
+    with open(USAGE_LOG, "rb") as f:
+        f.seek(cache["offset"])
+        chunk = f.read(st.st_size - cache["offset"])
+    complete = chunk[: chunk.rfind(b"\n") + 1]  # a writer may be mid-line
+
+    scores = cache["scores"]
+    for raw in complete.splitlines():
+        try:
+            event = json.loads(raw)
+            t, name = float(event["t"]), str(event["s"])
+            weight = float(event.get("w", WEIGHTS.get(event.get("e"), 1.0)))
+        except (ValueError, KeyError, TypeError):
+            continue
+        if cache["ref"] is None:
+            cache["ref"] = t
+        scores[name] = scores.get(name, 0.0) + weight * 2 ** (
+            (t - cache["ref"]) / HALF_LIFE
+        )
+        cache["lines"] += 1
+
+    cache.update(
+        ino=st.st_ino,
+        offset=cache["offset"] + len(complete),
+        order=sorted(scores, key=scores.__getitem__, reverse=True),
+    )
+    write_cache_json(FRECENCY_PATH, cache)
+    return cache
+
+
+def _compact(cache: dict) -> None:
+    """Rewrite the log as one line per session with its current weight."""
+    now = time.time()
+    shift = 2 ** ((cache["ref"] - now) / HALF_LIFE)
+    weights = {s: w * shift for s, w in cache["scores"].items()}
+    weights = {s: w for s, w in weights.items() if w >= MIN_WEIGHT}
+
+    tmp = USAGE_LOG.with_suffix(f".{os.getpid()}.tmp")
+    tmp.write_text(
+        "".join(
+            json.dumps({"t": now, "s": s, "w": w}, ensure_ascii=False) + "\n"
+            for s, w in weights.items()
+        )
+    )
+    os.replace(tmp, USAGE_LOG)
+    write_cache_json(FRECENCY_PATH, _empty())
+    _refresh()
+
+
+def record(names: Iterable[str], event: str) -> None:
+    """Append usage events (best effort: never fails the calling command)."""
+    from .edit import locked
+
+    now = time.time()
+    lines = "".join(
+        json.dumps({"t": now, "s": name, "e": event}, ensure_ascii=False) + "\n"
+        for name in names
+    )
+    if not lines:
+        return
+    try:
+        CACHE_DIR.mkdir(parents=True, exist_ok=True)
+        with locked(USAGE_LOG):
+            with open(USAGE_LOG, "a") as f:
+                f.write(lines)
+            cache = _refresh()
+            if cache["lines"] > COMPACT_LINES:
+                _compact(cache)
+    except OSError:
+        pass
+
+
+def frecency_order() -> list[str]:
+    """Session names used so far, most frecent first."""
+    return _refresh()["order"]
+
+
+def sort_by_frecency(names: list[str]) -> list[str]:
+    """Reorder names: most frecent first, never-used ones after in file order."""
+    present = set(names)
+    ranked = [n for n in frecency_order() if n in present]
+    seen = set(ranked)
+    return ranked + [n for n in names if n not in seen]
@@ -8,10 +8,14 @@ def get_parent_dir_name() -> str:
     return os.path.basename(os.getcwd())
 
 
+def to_tilde(path: str) -> str:
+    """Convert an absolute path to ~ format if it is under $HOME."""
+    home = os.path.expanduser("~")
+    if path.startswith(home):
+        return "~" + path[len(home) :]
+    return path
+
+
 def get_cwd_as_path() -> str:
     """Get current working directory in ~ format."""
-    cwd = os.getcwd()
-    home = os.path.expanduser("~")
-    if cwd.startswith(home):
-        return "~" + cwd[len(home) :]
-    return cwd
+    return to_tilde(os.getcwd())
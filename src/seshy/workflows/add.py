@@ -5,20 +5,51 @@ import sys
 import click
 
 from ..config import get_default_icon
-from ..fzf import fzf_select_icon, fzf_select_path_recursive
-from ..toml_ops import add_session, find_next_5x_number
-from ..ui import confirm, preview_session
-from ..utils import get_cwd_as_path, get_parent_dir_name
+from ..fzf import fzf_select_icon, fzf_select_project
+from ..toml_ops import add_session, add_sessions, find_next_5x_number
+from ..ui import confirm, preview_session, report_added
+from ..utils import get_cwd_as_path, get_parent_dir_name, to_tilde
 
 
-def run(quick: bool) -> None:
+def _current_branch_session() -> tuple[str, str]:
+    """(name, path) for the current git branch, or exit with an error."""
+    from ..git import current_branch
+    from .importer import plan_sessions
+
+    branch = current_branch()
+    if branch is None:
+        click.echo("Not on a git branch (outside a repository or detached).", err=True)
+        sys.exit(1)
+    _, skipped = plan_sessions(
+        [(branch.name, branch.path)], "", None,
+        unique_names=False, unique_paths=False,
+    )
+    if skipped:
+        click.echo(
+            f"A session for branch {branch.name!r} in {to_tilde(branch.path)} "
+            "already exists.",
+            err=True,
+        )
+        sys.exit(1)
+    return branch.name, to_tilde(branch.path)
+
+
+def run(quick: bool, from_branch: bool = False) -> None:
     """Add a new session to sesh.toml.
 
     Args:
         quick: If True, auto-fill from current directory.
                If False, prompt interactively.
+        from_branch: Auto-fill from the current git branch and its worktree
+               root (default icon, next 5x number).
     """
-    if quick:
+    # Auto-picked numbers are re-checked under the sesh.toml lock
+    renumber = True
+    if from_branch:
+        name, path = _current_branch_session()
+        icon = get_default_icon()
+        number = find_next_5x_number()
+    elif quick:
         name = get_parent_dir_name()
         path = get_cwd_as_path()
         icon = get_default_icon()
@@ -27,7 +58,7 @@ def run(quick: bool) -> None:
         name = click.prompt("Session name")
 
         click.echo("\nSelect project path...")
-        path = fzf_select_path_recursive()
+        path = fzf_select_project()
         if not path:
             click.echo("No path selected, aborting.", err=True)
             sys.exit(1)
@@ -39,6 +70,7 @@ def run(quick: bool) -> None:
             icon = get_default_icon()
 
         number = click.prompt("Session number", type=int)
+        renumber = False
 
     # Show preview
     click.echo("\n" + "=" * 40)
@@ -47,8 +79,65 @@ def run(quick: bool) -> None:
     click.echo(preview_session(name, path, icon, number))
     click.echo("=" * 40 + "\n")
 
-    if confirm("Add this session?"):
-        add_session(name, path, icon, number)
-        click.echo(f"Added session: {number} {name} {icon}")
-    else:
+    if not confirm("Add this session?"):
         click.echo("Aborted.")
+        return
+    added = add_session(name, path, icon, number, renumber)
+    if added is None:
+        click.echo(f"Session {number} {name} {icon} already exists.", err=True)
+        sys.exit(1)
+    click.echo(f"Added session: {added} {name} {icon}")
+
+
+def run_batch(
+    worktrees: bool,
+    pattern: str | None,
+    yes: bool = False,
+    dry_run: bool = False,
+) -> None:
+    """Add a session for every git worktree, or every branch matching a pattern.
+
+    Entries that already have a session with the same branch name and path
+    are skipped (for worktrees, any session at that path), so a branch name
+    like `main` can have a session in every repository. New sessions get
+    the default icon and consecutive numbers from the next 5x number, and
+    are written at once.
+
+    Args:
+        worktrees: One session per `git worktree list` entry.
+        pattern: One session per local branch matching this for-each-ref
+            pattern, e.g. "stack/*" (used when `worktrees` is False).
+        yes: Skip the confirmation prompt.
+        dry_run: Only show what would be added.
+    """
+    from .. import git
+    from .importer import plan_sessions
+
+    found = git.worktrees() if worktrees else git.branches(pattern or "")
+    if found is None:
+        click.echo("Not in a git repository.", err=True)
+        sys.exit(1)
+
+    candidates = [(b.name, b.path) for b in found]
+    sessions, skipped = plan_sessions(
+        candidates, get_default_icon(), find_next_5x_number(),
+        unique_names=False, unique_paths=worktrees,
+    )
+
+    for name, path in skipped:
+        click.echo(f"  = {name}  {to_tilde(path)} (duplicate)")
+    for name, path, icon, number in sessions:
+        click.echo(f"  + {number} {name} {icon}  {path}")
+
+    if not sessions:
+        click.echo("No new sessions to add.")
+        return
+
+    click.echo(f"\n{len(sessions)} new sessions, {len(skipped)} skipped.")
+    if dry_run:
+        return
+    if not yes and not confirm("Add these sessions?"):
+        click.echo("Aborted.")
+        return
+
+    report_added(sessions, add_sessions(sessions, renumber=True))
@@ -0,0 +1,219 @@
+"""Check workflow - find (and optionally fix) broken state in sesh.toml."""
+
+import json
+import os
+import sys
+from collections.abc import Callable
+from concurrent.futures import ThreadPoolExecutor
+from dataclasses import asdict, dataclass, replace
+from pathlib import Path
+
+import click
+
+from ..document import Document, SessionBlock, WindowBlock, parse_document
+from ..shards import Shard, locate, sync
+from ..toml_ops import SESH_TOML_PATH
+from ..ui import confirm
+
+# Concurrent path probes; slow or network-mounted homes block per stat
+PATH_CHECK_JOBS = 16
+
+
+@dataclass(frozen=True, slots=True)
+class Issue:
+    """One problem found in sesh.toml.
+
+    `kind` is one of: duplicate_name, missing_window, orphan_window,
+    duplicate_number, missing_path. `fixable` issues are repaired by --fix.
+    `file` and `line` point at sesh.toml, or at the sesh.d/ shard the block
+    comes from.
+    """
+
+    kind: str
+    line: int
+    message: str
+    session: str | None = None
+    fixable: bool = False
+    file: str = ""
+
+
+def orphan_windows(doc: Document, listed: set[str] | None = None) -> list[WindowBlock]:
+    """[[window]] blocks no session lists (in `doc`, or in `listed` if given)."""
+    if listed is None:
+        listed = {w for s in doc.sessions for w in s.windows}
+    return [w for w in doc.orphans if w.name not in listed]
+
+
+def _orphan_issue(w: WindowBlock) -> Issue:
+    return Issue(
+        "orphan_window", w.span.start_line,
+        f"[[window]] {w.name!r} is not listed by any session",
+        fixable=True,
+    )
+
+
+def structural_issues(
+    doc: Document, where: Callable[[int], str] = lambda line: f"line {line}"
+) -> list[Issue]:
+    """Everything detectable from the parsed document alone, in one pass.
+
+    `where` describes a line in messages that refer to another block.
+    """
+    issues = []
+    defined = {w.name for s in doc.sessions for w in s.owned}
+    defined.update(w.name for w in doc.orphans)
+    seen_names: dict[str, int] = {}
+    seen_numbers: dict[int, str] = {}
+
+    for s in doc.sessions:
+        if s.name in seen_names:
+            issues.append(Issue(
+                "duplicate_name", s.start_line,
+                f"session name also used at {where(seen_names[s.name])}", s.name,
+            ))
+            continue  # its windows and number repeat the first one's issues
+        seen_names[s.name] = s.start_line
+
+        for window in s.windows:
+            if window not in defined:
+                issues.append(Issue(
+                    "missing_window", s.start_line,
+                    f"window {window!r} has no [[window]] block", s.name,
+                ))
+
+        if s.number is not None and 50 <= s.number < 60:
+            if s.number in seen_numbers:
+                issues.append(Issue(
+                    "duplicate_number", s.start_line,
+                    f"number {s.number} also used by {seen_numbers[s.number]!r}",
+                    s.name,
+                ))
+            else:
+                seen_numbers[s.number] = s.name
+
+    issues.extend(_orphan_issue(w) for w in orphan_windows(doc))
+    return issues
+
+
+def missing_paths(doc: Document) -> set[str]:
+    """Session paths that don't exist, probed concurrently."""
+    paths = sorted({s.path for s in doc.sessions if s.path})
+    with ThreadPoolExecutor(max_workers=PATH_CHECK_JOBS) as pool:
+        exists = pool.map(lambda p: os.path.exists(os.path.expanduser(p)), paths)
+        return {p for p, ok in zip(paths, exists, strict=True) if not ok}
+
+
+def _path_issue(s: SessionBlock) -> Issue:
+    return Issue(
+        "missing_path", s.start_line, f"path {s.path} does not exist",
+        s.name, fixable=True,
+    )
+
+
+def path_issues(doc: Document, missing: set[str]) -> list[Issue]:
+    return [_path_issue(s) for s in doc.sessions if s.path in missing]
+
+
+def _issues(doc: Document, missing: set[str], layout: list[Shard]) -> list[Issue]:
+    """All issues, located in sesh.toml or its shards, in file order."""
+
+    def where(line: int) -> str:
+        path, line = locate(line, layout)
+        return f"line {line}" if path == SESH_TOML_PATH else f"{path.name}:{line}"
+
+    issues = []
+    for issue in structural_issues(doc, where) + path_issues(doc, missing):
+        path, line = locate(issue.line, layout)
+        issues.append((issue.line, replace(issue, line=line, file=str(path))))
+    return [issue for _, issue in sorted(issues, key=lambda i: i[0])]
+
+
+def _read() -> tuple[Document, list[Shard]]:
+    layout = sync()
+    return parse_document(SESH_TOML_PATH.read_text()), layout
+
+
+def fix(missing: set[str]) -> list[Issue]:
+    """Remove unlisted orphan windows and sessions whose path is gone.
+
+    Issues are found again under each file's edit lock, so changes made
+    since the check are respected. With shards, each shard is edited on its
+    own and a window counts as listed when a session in any shard lists it.
+    Returns the issues that were fixed.
+    """
+    from ..edit import transaction
+
+    doc, layout = _read()
+    paths: list[Path] = [shard.path for shard in layout] or [SESH_TOML_PATH]
+    listed = {w for s in doc.sessions for w in s.windows} if layout else None
+
+    fixed = []
+    for path in paths:
+        with transaction(path) as tx:
+            for w in orphan_windows(tx.doc, listed):
+                tx.remove_window(w)
+                fixed.append(replace(_orphan_issue(w), file=str(path)))
+            # Remove the blocks themselves: a name may be shared by a
+            # session whose path does exist
+            for s in tx.doc.sessions:
+                if s.path in missing:
+                    tx.remove_session(s)
+                    fixed.append(replace(_path_issue(s), file=str(path)))
+    sync()
+    return fixed
+
+
+def run(apply_fix: bool = False, yes: bool = False, as_json: bool = False) -> None:
+    """Check sesh.toml and report problems; exit 1 if any remain.
+
+    Args:
+        apply_fix: Remove orphan windows and sessions with missing paths.
+        yes: Skip the confirmation prompt for --fix.
+        as_json: Print {"path", "issues", "fixed"} as JSON instead of text.
+    """
+    doc, layout = _read()
+    missing = missing_paths(doc)
+    issues = _issues(doc, missing, layout)
+
+    fixed: list[Issue] = []
+    fixable = [i for i in issues if i.fixable]
+    if apply_fix and fixable:
+        if not yes:
+            if as_json:
+                click.echo("Use --yes with --fix --json.", err=True)
+                sys.exit(1)
+            for issue in fixable:
+                click.echo(f"  - {issue.file}:{issue.line}: {issue.message}")
+            if not confirm(f"Remove these {len(fixable)} blocks?"):
+                click.echo("Aborted.")
+                apply_fix = False
+        if apply_fix:
+            fixed = fix(missing)
+            doc, layout = _read()
+            issues = _issues(doc, missing, layout)
+
+    if as_json:
+        click.echo(json.dumps(
+            {
+                "path": str(SESH_TOML_PATH),
+                "issues": [asdict(i) for i in issues],
+                "fixed": [asdict(i) for i in fixed],
+            },
+            ensure_ascii=False,
+            indent=2,
+        ))
+    else:
+        for issue in fixed:
+            click.echo(f"fixed: {issue.kind}: {issue.message}")
+        for issue in issues:
+            where = f" ({issue.session})" if issue.session else ""
+            click.echo(
+                f"{issue.file}:{issue.line}: {issue.kind}: {issue.message}{where}"
+            )
+        if not issues:
+            click.echo(f"{len(doc.sessions)} sessions, no problems found.")
+        elif not apply_fix and any(i.fixable for i in issues):
+            click.echo("\nRun with --fix to remove orphan windows and missing paths.")
+
+    if issues:
+        sys.exit(1)
@@ -4,31 +4,67 @@ import sys
 
 import click
 
-from ..fzf import fzf_select
-from ..toml_ops import delete_session, list_sessions
+from ..fzf import fzf_select, fzf_select_multi
+from ..groups import match_sessions
+from ..toml_ops import delete_sessions, list_sessions
 from ..ui import confirm
+from ..usage import sort_by_frecency
 
 
-def run() -> None:
-    """Select a session and delete it (with associated windows)."""
+def _select(sessions: list[str], multi: bool, pattern: str | None) -> list[str]:
+    """Pick sessions to delete by pattern, fzf multi-select or single fzf pick."""
+    if pattern is not None:
+        try:
+            return match_sessions([pattern], sessions)
+        except ValueError as e:
+            click.echo(f"Invalid pattern: {e}", err=True)
+            sys.exit(1)
+    sessions = sort_by_frecency(sessions)
+    if multi:
+        return fzf_select_multi(sessions, "delete (TAB to mark)> ", preview=True)
+    selected = fzf_select(sessions, "delete> ", preview=True)
+    return [selected] if selected else []
+
+
+def run(multi: bool = False, pattern: str | None = None, yes: bool = False) -> None:
+    """Select one or more sessions and delete them (with associated windows).
+
+    Args:
+        multi: Use fzf --multi to mark several sessions.
+        pattern: Delete every session matching this wildcard pattern (no fzf).
+        yes: Skip the confirmation prompt.
+    """
     sessions = list_sessions()
     if not sessions:
         click.echo("No sessions found.", err=True)
         sys.exit(1)
 
-    selected = fzf_select(sessions, "delete> ")
+    selected = _select(sessions, multi, pattern)
     if not selected:
-        click.echo("No session selected.", err=True)
+        if pattern is not None:
+            click.echo(f"No sessions matched pattern: {pattern}", err=True)
+        else:
+            click.echo("No session selected.", err=True)
         sys.exit(1)
 
-    click.echo(f"\nAbout to delete session: {selected}")
+    if len(selected) == 1:
+        click.echo(f"\nAbout to delete session: {selected[0]}")
+    else:
+        click.echo(f"\nAbout to delete {len(selected)} sessions:")
+        for name in selected:
+            click.echo(f"  - {name}")
     click.echo("This will also remove associated [[window]] blocks.\n")
 
-    if confirm("Delete this session?"):
-        if delete_session(selected):
-            click.echo(f"Deleted session: {selected}")
-        else:
-            click.echo(f"Failed to delete session: {selected}", err=True)
-            sys.exit(1)
-    else:
+    prompt = "Delete this session?" if len(selected) == 1 else "Delete these sessions?"
+    if not yes and not confirm(prompt):
         click.echo("Aborted.")
+        return
+
+    deleted = delete_sessions(selected)
+    for name in deleted:
+        click.echo(f"Deleted session: {name}")
+
+    missing = [name for name in selected if name not in deleted]
+    if missing:
+        click.echo(f"Failed to delete session: {', '.join(missing)}", err=True)
+        sys.exit(1)
@@ -0,0 +1,53 @@
+"""Groups workflow - show startup groups and the sessions they resolve to."""
+
+import json
+import sys
+
+import click
+
+from ..config import get_group_regexes, get_startup_groups
+from ..groups import resolve_groups
+from ..toml_ops import list_sessions
+
+
+def list_groups() -> None:
+    """List available startup groups with their patterns and session counts."""
+    groups = get_startup_groups()
+
+    if not groups:
+        click.echo("No startup groups defined.", err=True)
+        click.echo("\nAdd [groups] to ~/.config/seshy/config.toml:", err=True)
+        click.echo('  [groups]\n  work = ["dotfiles*", "caes*", "cam*"]', err=True)
+        sys.exit(1)
+
+    members = resolve_groups(get_group_regexes(), list_sessions())
+    click.echo("Available groups:\n")
+    for name, patterns in groups.items():
+        click.echo(f"  {name} ({len(members[name])} sessions)")
+        for pattern in patterns:
+            click.echo(f"    - {pattern}")
+    click.echo("\nUsage: seshy startup <group>")
+
+
+def run(names: tuple[str, ...] = (), resolve: bool = False) -> None:
+    """List groups, or print {group: [sessions]} as JSON with `resolve`.
+
+    Args:
+        names: Groups to resolve (all groups when empty).
+        resolve: Emit resolved membership as JSON instead of the listing.
+    """
+    if not resolve:
+        list_groups()
+        return
+
+    regexes = get_group_regexes()
+    unknown = [n for n in names if n not in regexes]
+    if unknown:
+        click.echo(f"Unknown groups: {', '.join(unknown)}", err=True)
+        click.echo(f"Available: {', '.join(regexes.keys())}", err=True)
+        sys.exit(1)
+
+    if names:
+        regexes = {n: regexes[n] for n in names}
+    members = resolve_groups(regexes, list_sessions())
+    click.echo(json.dumps(members, ensure_ascii=False, indent=2))
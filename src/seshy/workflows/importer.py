@@ -0,0 +1,141 @@
+"""Import workflow - create many sessions from existing directories at once."""
+
+import glob
+import os
+import sys
+
+import click
+
+from ..config import get_default_icon
+from ..index import load_index
+from ..toml_ops import add_sessions, allocate_numbers, base_name
+from ..ui import confirm, report_added
+from ..utils import to_tilde
+
+
+def _normalize(path: str) -> str:
+    """Absolute, normalized form of a (possibly relative or ~) path."""
+    return os.path.abspath(os.path.expanduser(path))
+
+
+def collect_paths(
+    directory: str | None, from_stdin: bool, pattern: str | None
+) -> list[str]:
+    """Gather candidate directories from a tree, stdin and/or a glob."""
+    paths: list[str] = []
+    if directory:
+        from ..projects import iter_projects
+
+        paths.extend(iter_projects(roots=[directory], repos_only=True))
+    if from_stdin:
+        paths.extend(line.strip() for line in sys.stdin if line.strip())
+    if pattern:
+        paths.extend(sorted(glob.glob(os.path.expanduser(pattern))))
+    return [p for p in paths if os.path.isdir(os.path.expanduser(p))]
+
+
+def plan_sessions(
+    candidates: list[tuple[str, str]],
+    icon: str,
+    start: int | None,
+    unique_names: bool = True,
+    unique_paths: bool = True,
+) -> tuple[list[tuple[str, str, str, int]], list[tuple[str, str]]]:
+    """Work out which (name, path) candidates become sessions.
+
+    Returns (sessions to add as (name, path, icon, number), skipped
+    candidates). A candidate is skipped when a session with the same name
+    and path is already in the index or earlier in the batch. With
+    `unique_names` (or `unique_paths`) a matching name (or path) alone is
+    enough. Numbers are allocated together.
+    """
+    index = load_index()
+    taken_names = {base_name(e.name) for e in index}
+    taken_paths = {_normalize(e.path) for e in index if e.path}
+    taken = {(base_name(e.name), _normalize(e.path)) for e in index if e.path}
+
+    accepted: list[tuple[str, str]] = []
+    skipped: list[tuple[str, str]] = []
+    for name, path in candidates:
+        norm = _normalize(path)
+        if (
+            (name, norm) in taken
+            or (unique_names and name in taken_names)
+            or (unique_paths and norm in taken_paths)
+        ):
+            skipped.append((name, path))
+            continue
+        taken_names.add(name)
+        taken_paths.add(norm)
+        taken.add((name, norm))
+        accepted.append((name, to_tilde(norm)))
+
+    numbers = allocate_numbers(len(accepted), start)
+    sessions = [
+        (name, path, icon, number)
+        for (name, path), number in zip(accepted, numbers, strict=True)
+    ]
+    return sessions, skipped
+
+
+def plan_import(
+    paths: list[str], icon: str, start: int | None
+) -> tuple[list[tuple[str, str, str, int]], list[str]]:
+    """Work out which paths become sessions, named after their directory.
+
+    Returns (sessions to add as (name, path, icon, number), skipped paths).
+    """
+    candidates = [(os.path.basename(_normalize(p)), p) for p in paths]
+    sessions, skipped = plan_sessions(candidates, icon, start)
+    return sessions, [path for _, path in skipped]
+
+
+def run(
+    directory: str | None,
+    from_stdin: bool,
+    pattern: str | None,
+    icon: str | None = None,
+    start: int | None = None,
+    yes: bool = False,
+    dry_run: bool = False,
+) -> None:
+    """Create a session for every new directory from the given sources.
+
+    Args:
+        directory: Tree to scan for git repositories (uses [paths] depth/ignore).
+        from_stdin: Read newline-delimited paths from stdin.
+        pattern: Glob of directories, e.g. "~/code/*".
+        icon: Icon for all new sessions (defaults to [icons] default).
+        start: First session number (defaults to after the highest in use).
+        yes: Skip the confirmation prompt.
+        dry_run: Only show what would be added.
+    """
+    if not (directory or from_stdin or pattern):
+        click.echo("Nothing to import: pass a DIRECTORY, --stdin or --glob.", err=True)
+        sys.exit(1)
+
+    paths = collect_paths(directory, from_stdin, pattern)
+    sessions, skipped = plan_import(paths, icon or get_default_icon(), start)
+
+    for path in skipped:
+        click.echo(f"  = {path} (duplicate)")
+    for name, path, session_icon, number in sessions:
+        click.echo(f"  + {number} {name} {session_icon}  {path}")
+
+    if not sessions:
+        click.echo("No new sessions to import.")
+        return
+
+    click.echo(f"\n{len(sessions)} new sessions, {len(skipped)} skipped.")
+    if dry_run:
+        return
+
+    if not yes:
+        if from_stdin:
+            click.echo("Use --yes to confirm when reading paths from stdin.", err=True)
+            sys.exit(1)
+        if not confirm("Import these sessions?"):
+            click.echo("Aborted.")
+            return
+
+    report_added(sessions, add_sessions(sessions, renumber=True), "Imported")
@@ -0,0 +1,153 @@
+"""Listing workflow - session records for scripts (`seshy ls --json` etc.).
+
+Each record comes straight from the session index:
+
+    {"name": "52 feat-x 🚀", "number": 52, "title": "feat-x", "icon": "🚀",
+     "path": "~/code/x", "windows": ["editor"],
+     "file": "/home/me/.config/sesh/sesh.toml", "line": 40, "end_line": 47}
+
+`file` is the sesh.d/ shard the session is defined in when shards are used;
+`line` and `end_line` are lines of that file.
+
+Records are written one at a time as they are built, so a consumer reading
+--ndjson can start before the last one is out.
+"""
+
+import json
+import re
+import string
+import sys
+from collections import deque
+from collections.abc import Iterator
+
+import click
+
+from ..shards import Shard, locate, sync
+from ..toml_ops import base_name, icon_of
+
+FIELDS = (
+    "name", "number", "title", "icon", "path", "windows", "file", "line",
+    "end_line",
+)
+
+
+def _entries() -> list[dict]:
+    """Index entries as dicts, from the daemon when one is running."""
+    from ..daemon import request
+
+    ok, entries = request("entries")
+    if ok and entries is not None:
+        return entries
+
+    from dataclasses import asdict
+
+    from ..index import load_index
+
+    return [asdict(e) for e in load_index()]
+
+
+def to_record(entry: dict, layout: list[Shard]) -> dict:
+    name = entry["name"]
+    file, line = locate(entry["start_line"], layout)
+    return {
+        "name": name,
+        "number": entry["number"],
+        "title": base_name(name),
+        "icon": icon_of(name),
+        "path": entry["path"],
+        "windows": list(entry["windows"]),
+        "file": str(file),
+        "line": line,
+        "end_line": line + entry["end_line"] - entry["start_line"],
+    }
+
+
+def records(names: list[str]) -> Iterator[dict]:
+    """Records for `names`, in that order."""
+    layout = sync()
+    by_name: dict[str, deque[dict]] = {}
+    for entry in _entries():
+        by_name.setdefault(entry["name"], deque()).append(entry)
+    for name in names:
+        queue = by_name.get(name)
+        if queue:
+            yield to_record(queue.popleft(), layout)
+
+
+def _unescape(fmt: str) -> str:
+    """Turn literal \\t, \\n and \\\\ (as typed in a shell) into characters."""
+    return (
+        fmt.replace("\\\\", "\0").replace("\\t", "\t").replace("\\n", "\n")
+        .replace("\0", "\\")
+    )
+
+
+# Validates --format with the real value types (int numbers and lines)
+_SAMPLE = {
+    "name": "51 proj 💻", "number": 51, "title": "proj", "icon": "💻",
+    "path": "~/code/proj", "windows": ["editor"], "file": "sesh.toml",
+    "line": 1, "end_line": 2,
+}
+
+
+def _formatter(fmt: str):
+    template = _unescape(fmt)
+
+    def render(record: dict) -> str:
+        values = {}
+        for k, v in record.items():
+            if isinstance(v, list):
+                v = ",".join(v)
+            elif v is None and k not in specced:
+                v = ""  # a spec like :03d can't take "", so None is an error there
+            values[k] = v
+        return template.format_map(values)
+
+    try:
+        specced = {
+            re.split(r"[.\[]", field)[0]
+            for _, field, spec, _ in string.Formatter().parse(template)
+            if field and spec
+        }
+        render(_SAMPLE)
+    except (KeyError, IndexError, ValueError, TypeError, AttributeError) as e:
+        click.echo(f"Invalid --format {fmt!r}: {e!r}", err=True)
+        click.echo(f"Fields: {', '.join(FIELDS)}", err=True)
+        sys.exit(1)
+    return render
+
+
+def run(names: list[str], style: str, fmt: str | None = None) -> None:
+    """Write records for `names` to stdout.
+
+    Args:
+        names: Sessions to show, already filtered/sorted/limited.
+        style: "json" (one array), "ndjson" (one object per line) or "format".
+        fmt: str.format template for style "format", e.g. "{number}\\t{name}".
+    """
+    out = sys.stdout
+    if style == "format":
+        render = _formatter(fmt or "{name}")
+        failed = False
+        for record in records(names):
+            try:
+                line = render(record)
+            except (ValueError, TypeError) as e:
+                # e.g. {number:03d} for a session without a number
+                click.echo(f"{record['name']}: {e}", err=True)
+                failed = True
+                continue
+            out.write(line + "\n")
+        out.flush()
+        if failed:
+            sys.exit(1)
+    elif style == "ndjson":
+        for record in records(names):
+            out.write(json.dumps(record, ensure_ascii=False) + "\n")
+    else:
+        out.write("[")
+        for i, record in enumerate(records(names)):
+            line = json.dumps(record, ensure_ascii=False)
+            out.write(("," if i else "") + "\n  " + line)
+        out.write("\n]\n")
+    out.flush()
@@ -1,61 +1,226 @@
 """Startup workflow - launch multiple sessions at once."""
 
-import fnmatch
+import heapq
+import os
 import subprocess
 import sys
+import time
+from collections.abc import Callable
+from concurrent.futures import FIRST_COMPLETED, Future, ThreadPoolExecutor, wait
 
 import click
 
-from ..config import get_startup_groups
+from ..config import (
+    DEFAULT_STARTUP_TIMEOUT,
+    StartupStage,
+    get_group_regexes,
+    get_startup_groups,
+    get_startup_jobs,
+    get_startup_stages,
+    get_startup_timeout,
+)
+from ..groups import resolve_groups
+from ..tmux import is_live, live_sessions, pane_commands
 from ..toml_ops import list_sessions
+from ..tracing import span
+from ..usage import record, sort_by_frecency
 
 
-def match_sessions(patterns: list[str], sessions: list[str]) -> list[str]:
-    """Match session names against patterns (supports wildcards)."""
-    matched = []
-    for session in sessions:
-        for pattern in patterns:
-            if fnmatch.fnmatch(session.lower(), pattern.lower()):
-                matched.append(session)
-                break
-    return matched
+def launch_session(name: str, timeout: float | None = None) -> bool:
+    """Launch a session via sesh connect (detached)."""
+    with span("subprocess.sesh", session=name) as s:
+        try:
+            subprocess.run(
+                ["sesh", "connect", name],
+                check=True,
+                capture_output=True,
+                timeout=timeout,
+            )
+            return True
+        except (subprocess.CalledProcessError, subprocess.TimeoutExpired) as e:
+            s.set(failed=type(e).__name__)
+            return False
 
 
-def launch_session(name: str) -> bool:
-    """Launch a session via sesh connect (detached)."""
+Launcher = Callable[[str, float | None], bool]
+
+# Seconds between readiness probes
+READY_POLL = 0.2
+
+
+def _probe(name: str, check: str, timeout: float) -> bool:
+    """Run one readiness check for a session."""
+    if check.startswith("pane:"):
+        return check[5:] in pane_commands(name)
     try:
-        subprocess.run(
-            ["sesh", "connect", name],
-            check=True,
+        result = subprocess.run(
+            check,
+            shell=True,
             capture_output=True,
+            timeout=timeout,
+            env={**os.environ, "SESHY_SESSION": name},
         )
-        return True
-    except subprocess.CalledProcessError:
+    except subprocess.TimeoutExpired:
         return False
+    return result.returncode == 0
 
 
-def list_groups() -> None:
-    """List available startup groups."""
-    groups = get_startup_groups()
-    sessions = list_sessions()
+def wait_ready(name: str, check: str, timeout: float) -> bool:
+    """Poll a readiness check until it passes or `timeout` seconds elapse."""
+    deadline = time.monotonic() + timeout
+    with span("startup.ready", session=name, check=check) as s:
+        while True:
+            if _probe(name, check, max(deadline - time.monotonic(), READY_POLL)):
+                return True
+            if time.monotonic() + READY_POLL > deadline:
+                s.set(failed="timeout")
+                return False
+            time.sleep(READY_POLL)
 
-    if not groups:
-        click.echo("No startup groups defined.", err=True)
-        click.echo("\nAdd [groups] to ~/.config/seshy/config.toml:", err=True)
-        click.echo('  [groups]\n  work = ["dotfiles*", "caes*", "cam*"]', err=True)
-        sys.exit(1)
 
-    click.echo("Available groups:\n")
-    for name, patterns in groups.items():
-        matched = match_sessions(patterns, sessions)
-        click.echo(f"  {name} ({len(matched)} sessions)")
-        for pattern in patterns:
-            click.echo(f"    - {pattern}")
-    click.echo("\nUsage: seshy startup <group>")
+def _timed_launch(
+    launcher: Launcher,
+    name: str,
+    timeout: float | None,
+    stage: StartupStage | None,
+) -> tuple[bool, float, str]:
+    """Launch a session, run its stage's readiness check.
+
+    Returns (ok, elapsed seconds, note for the report line).
+    """
+    start = time.monotonic()
+    ok = launcher(name, timeout)
+    note = ""
+    if ok and stage is not None and stage.ready:
+        ready_timeout = stage.ready_timeout or timeout or DEFAULT_STARTUP_TIMEOUT
+        if not wait_ready(name, stage.ready, ready_timeout):
+            ok, note = False, f", not ready after {ready_timeout:g}s"
+    return ok, time.monotonic() - start, note
+
+
+Plan = list[tuple[StartupStage | None, list[str]]]
+
+
+def plan_stages(sessions: list[str], stages: tuple[StartupStage, ...]) -> Plan:
+    """Split sessions into launch stages, keeping the given order within each.
+
+    A session goes to the first stage whose patterns match it; the rest form
+    a final stage. Stages with no sessions are dropped.
+    """
+    buckets: list[list[str]] = [[] for _ in stages]
+    rest = []
+    for session in sessions:
+        for bucket, stage in zip(buckets, stages, strict=True):
+            if stage.regex.match(session):
+                bucket.append(session)
+                break
+        else:
+            rest.append(session)
 
+    plan: Plan = [(st, b) for st, b in zip(stages, buckets, strict=True) if b]
+    if rest:
+        plan.append((None, rest))
+    return plan
 
-def run(group_name: str | None) -> None:
-    """Run startup workflow for a named group."""
+
+def layout_launcher(sessions: list[str]) -> Launcher:
+    """Launcher that builds each session's layout in one tmux call."""
+    from ..layout import build_session, session_layouts
+
+    layouts = session_layouts(sessions)
+
+    def launch(name: str, timeout: float | None) -> bool:
+        if name not in layouts:
+            return False
+        path, windows = layouts[name]
+        return build_session(name, path, windows, timeout)
+
+    return launch
+
+
+def launch_sessions(
+    plan: Plan,
+    jobs: int,
+    timeout: float | None,
+    launcher: Launcher = launch_session,
+) -> tuple[list[str], list[str], float | None]:
+    """Launch sessions stage by stage with at most `jobs` in flight.
+
+    A stage is released once every earlier stage with `wait` (the default)
+    has finished, readiness checks included; `wait = false` stages don't
+    hold back the stages after them. Free slots go to released sessions of
+    waited-on stages (and the final unmatched stage) before background
+    `wait = false` ones, then in plan order, so a heavy background stage
+    never keeps a later priority stage queued. Streams a ✓/✗ line per
+    session as each one finishes.
+
+    Returns (launched, failed, seconds until the first session was ready),
+    the lists in plan order.
+    """
+    start = time.monotonic()
+    results: dict[str, bool] = {}
+    first_ready: float | None = None
+    outstanding: dict[Future, str] = {}
+    # (background?, stage index, position, stage, session), smallest first
+    queue: list[tuple[bool, int, int, StartupStage | None, str]] = []
+    blocking: set[str] = set()  # sessions the next stage release waits for
+    released = 0
+
+    def release() -> None:
+        """Queue stages up to and including the next one that must finish."""
+        nonlocal released
+        while released < len(plan) and not blocking:
+            stage, sessions = plan[released]
+            background = stage is not None and not stage.wait
+            for i, session in enumerate(sessions):
+                heapq.heappush(queue, (background, released, i, stage, session))
+            if not background:
+                blocking.update(sessions)
+            released += 1
+
+    with ThreadPoolExecutor(max_workers=max(1, jobs)) as pool:
+        release()
+        while queue or outstanding:
+            while queue and len(outstanding) < max(1, jobs):
+                *_, stage, session = heapq.heappop(queue)
+                future = pool.submit(_timed_launch, launcher, session, timeout, stage)
+                outstanding[future] = session
+
+            done, _ = wait(outstanding, return_when=FIRST_COMPLETED)
+            for future in done:
+                session = outstanding.pop(future)
+                ok, elapsed, note = future.result()
+                results[session] = ok
+                blocking.discard(session)
+                if ok:
+                    if first_ready is None:
+                        first_ready = time.monotonic() - start
+                    click.echo(f"  ✓ {session} ({elapsed:.1f}s{note})")
+                else:
+                    click.echo(f"  ✗ {session} ({elapsed:.1f}s{note})", err=True)
+            release()
+
+    ordered = [s for _, sessions in plan for s in sessions]
+    launched = [s for s in ordered if results[s]]
+    failed = [s for s in ordered if not results[s]]
+    return launched, failed, first_ready
+
+
+def run(
+    group_name: str | None,
+    jobs: int | None = None,
+    timeout: float | None = None,
+    build: bool = False,
+) -> None:
+    """Run startup workflow for a named group.
+
+    Args:
+        group_name: Group from [groups] in config.toml, or None to list groups.
+        jobs: Max concurrent launches (defaults to [startup] jobs).
+        timeout: Per-session timeout in seconds (defaults to [startup] timeout).
+        build: Create sessions directly with one chained tmux call each,
+               instead of `sesh connect` + startup_script helpers.
+    """
     groups = get_startup_groups()
 
     if not groups:
@@ -65,6 +230,8 @@ def run(group_name: str | None) -> None:
         sys.exit(1)
 
     if group_name is None:
+        from .groups import list_groups
+
         list_groups()
         return
 
@@ -73,28 +240,47 @@ def run(group_name: str | None) -> None:
         click.echo(f"Available: {', '.join(groups.keys())}", err=True)
         sys.exit(1)
 
+    from ..daemon import request
+
     patterns = groups[group_name]
-    sessions = list_sessions()
-    matched = match_sessions(patterns, sessions)
+    ok, matched = request("resolve", group=group_name)
+    if not ok or matched is None:
+        regex = get_group_regexes()[group_name]
+        matched = resolve_groups({group_name: regex}, list_sessions())[group_name]
 
     if not matched:
         click.echo(f"No sessions matched patterns: {patterns}", err=True)
         sys.exit(1)
 
-    click.echo(f"Launching {len(matched)} sessions...")
+    if jobs is None:
+        jobs = get_startup_jobs()
+    if timeout is None:
+        timeout = get_startup_timeout()
 
-    launched = []
-    failed = []
+    live = live_sessions()
+    running = [s for s in matched if is_live(s, live)]
+    missing = [s for s in matched if not is_live(s, live)]
 
-    for session in matched:
-        if launch_session(session):
-            launched.append(session)
-            click.echo(f"  ✓ {session}")
-        else:
-            failed.append(session)
-            click.echo(f"  ✗ {session}", err=True)
+    if running:
+        click.echo(f"Skipping {len(running)} already running sessions.")
+    if not missing:
+        click.echo(f"All {len(matched)} sessions already running.")
+        return
+
+    # Most used first within each stage
+    plan = plan_stages(sort_by_frecency(missing), get_startup_stages())
+    if len(plan) > 1:
+        click.echo(f"Launching {len(missing)} sessions in {len(plan)} stages...")
+    else:
+        click.echo(f"Launching {len(missing)} sessions...")
+
+    launcher = layout_launcher(missing) if build else launch_session
+    launched, failed, first_ready = launch_sessions(plan, jobs, timeout, launcher)
+    record(launched, "launch")
 
-    click.echo(f"\nLaunched {len(launched)}/{len(matched)} sessions.")
+    click.echo(f"\nLaunched {len(launched)}/{len(missing)} sessions.")
+    if first_ready is not None:
+        click.echo(f"First session ready after {first_ready:.1f}s.")
 
     if failed:
         click.echo(f"Failed: {', '.join(failed)}", err=True)
@@ -0,0 +1,34 @@
+"""Status workflow - show which configured sessions are running."""
+
+import sys
+
+import click
+
+from ..config import get_group_regexes
+from ..groups import resolve_groups
+from ..tmux import is_live, live_sessions
+from ..toml_ops import list_sessions
+
+
+def run(group_name: str | None) -> None:
+    """Show live/stopped state for all sessions, or those in a group."""
+    sessions = list_sessions()
+    if group_name is not None:
+        groups = get_group_regexes()
+        if group_name not in groups:
+            click.echo(f"Group '{group_name}' not found.", err=True)
+            click.echo(f"Available: {', '.join(groups.keys())}", err=True)
+            sys.exit(1)
+        regex = groups[group_name]
+        sessions = resolve_groups({group_name: regex}, sessions)[group_name]
+
+    live = live_sessions()
+    running = 0
+    for session in sessions:
+        if is_live(session, live):
+            running += 1
+            click.echo(f"  ● {session}")
+        else:
+            click.echo(f"  ○ {session}")
+
+    click.echo(f"\n{running}/{len(sessions)} sessions running.")
@@ -0,0 +1,23 @@
+"""Shared test setup.
+
+seshy resolves ~/.config and ~/.cache paths at import time, so HOME is
+pointed at a throwaway directory before any test imports it. The config
+there defines one quick window, which `Transaction.add` writes out.
+"""
+
+import os
+import sys
+import tempfile
+from pathlib import Path
+
+HOME = Path(tempfile.mkdtemp(prefix="seshy-test-home-"))
+os.environ["HOME"] = str(HOME)
+os.environ["SESHY_NO_DAEMON"] = "1"
+
+(HOME / ".config" / "seshy").mkdir(parents=True)
+(HOME / ".config" / "seshy" / "config.toml").write_text(
+    '[[quick.windows]]\nname = "editor"\nstartup_script = "win-editor-git"\n'
+)
+
+# bench/gen_sesh_toml.py generates the realistic fixture file
+sys.path.insert(0, str(Path(__file__).resolve().parent.parent / "bench"))
@@ -0,0 +1,21 @@
+"""check --fix removes the exact broken blocks."""
+
+from seshy.document import parse_document
+from seshy.toml_ops import SESH_TOML_PATH
+from seshy.workflows.check import fix, missing_paths
+
+
+def test_fix_removes_the_duplicate_with_the_missing_path(tmp_path):
+    SESH_TOML_PATH.parent.mkdir(parents=True, exist_ok=True)
+    SESH_TOML_PATH.write_text(
+        f'[[session]]\nname = "x"\npath = "{tmp_path}"\n\n'
+        '# ---\n\n[[session]]\nname = "x"\npath = "~/gone"\n'
+    )
+    try:
+        fixed = fix(missing_paths(parse_document(SESH_TOML_PATH.read_text())))
+        assert [(i.kind, i.line) for i in fixed] == [("missing_path", 7)]
+        assert SESH_TOML_PATH.read_text() == (
+            f'[[session]]\nname = "x"\npath = "{tmp_path}"\n'
+        )
+    finally:
+        SESH_TOML_PATH.unlink()
@@ -0,0 +1,141 @@
+"""parse_document: session/window spans and window ownership."""
+
+import re
+
+import click
+import pytest
+
+from seshy.document import parse_document
+
+TEXT = """\
+# sesh config
+
+[[window]]
+name = "shared"
+startup_script = "win-shared"
+
+# ---
+
+[[session]]
+name = "1 dotfiles 💻"
+path = "~/dotfiles"
+windows = ["editor", "shared"]
+
+[[window]]
+name = "editor"
+startup_script = "win-editor-git"
+
+[[session]]
+name = "51 notes 📦"
+path = "~/notes"
+windows = ["notes"]
+
+[[window]]
+name = "notes"
+startup_script = \"\"\"
+echo '[[session]]'
+[[session]]
+\"\"\"
+
+# ---
+
+[[session]]
+name = "52 api 🚀"
+path = "~/api"
+"""
+
+
+@pytest.fixture
+def doc():
+    return parse_document(TEXT)
+
+
+def test_sessions_in_order(doc):
+    names = [s.name for s in doc.sessions]
+    assert names == ["1 dotfiles 💻", "51 notes 📦", "52 api 🚀"]
+    assert [s.number for s in doc.sessions] == [1, 51, 52]
+    assert doc.sessions[0].windows == ("editor", "shared")
+
+
+def test_session_spans(doc):
+    dotfiles, notes, api = doc.sessions
+    assert (dotfiles.span.start_line, dotfiles.span.end_line) == (9, 12)
+    assert dotfiles.block_start == 7  # its `# ---`
+    assert dotfiles.end_line == 16  # last line of its owned [[window]]
+    assert notes.start_line == 18
+    assert api.start_line == 32 and api.end_line == 34
+
+
+def test_byte_spans_cover_block_text(doc):
+    data = TEXT.encode()
+    api = doc.sessions[2]
+    block = data[api.span.start_byte : api.span.end_byte].decode()
+    assert block == '[[session]]\nname = "52 api 🚀"\npath = "~/api"\n'
+
+
+def test_shared_window_defined_before_sessions_is_orphan(doc):
+    assert [w.name for w in doc.orphans] == ["shared"]
+    assert [w.name for w in doc.sessions[0].owned] == ["editor"]
+    # ...but still resolves for the session that lists it
+    assert doc.window_scripts(doc.sessions[0]) == [
+        ("editor", "win-editor-git"),
+        ("shared", "win-shared"),
+    ]
+
+
+def test_header_inside_multiline_string_is_not_a_table(doc):
+    notes = doc.sessions[1]
+    assert [w.name for w in notes.owned] == ["notes"]
+    assert notes.end_line == 28
+    assert "[[session]]" in notes.owned[0].startup_script
+
+
+def test_missing_separator_starts_block_at_header(doc):
+    notes = doc.sessions[1]
+    assert notes.block_start == notes.start_line
+    assert notes.line_ranges() == [(18, 21), (23, 28)]
+
+
+def test_window_not_listed_by_session_above_is_orphan():
+    doc = parse_document(
+        '[[session]]\nname = "a"\nwindows = ["x"]\n\n'
+        '[[window]]\nname = "y"\nstartup_script = "s"\n'
+    )
+    assert doc.sessions[0].owned == ()
+    assert [w.name for w in doc.orphans] == ["y"]
+
+
+def test_get_returns_first_of_duplicates():
+    doc = parse_document(
+        '[[session]]\nname = "a"\npath = "1"\n\n[[session]]\nname = "a"\npath = "2"\n'
+    )
+    assert doc.get("a").path == "1"
+    assert doc.get("missing") is None
+
+
+@pytest.mark.parametrize(
+    "text",
+    [
+        'session = [{name = "x", path = "~"}]\n',
+        'window = [{name = "w", startup_script = "s"}]\n\n[[session]]\nname = "x"\n',
+        "[[session\n",
+    ],
+)
+def test_unsupported_or_invalid_file_raises_click_exception(text, tmp_path):
+    path = tmp_path / "sesh.toml"
+    with pytest.raises(click.ClickException, match=re.escape(str(path))):
+        parse_document(text, path)
+
+
+def test_by_number_returns_every_session_with_that_number(doc):
+    assert [s.name for s in doc.by_number(51)] == ["51 notes 📦"]
+    assert doc.by_number(7) == []
+
+
+def test_trailing_comments_are_left_to_the_next_block():
+    doc = parse_document(
+        '[[session]]\nname = "a"\n# about b\n\n# >>> sesh.d/b.toml\n'
+        '[[session]]\nname = "b"\n'
+    )
+    assert doc.sessions[0].span.end_line == 2
+    assert doc.sessions[0].block_start == 1
@@ -0,0 +1,157 @@
+"""Transaction output, byte for byte, and the tomllib/tomlkit cross-check."""
+
+import pytest
+from gen_sesh_toml import generate
+
+from seshy.edit import transaction
+from seshy.toml_ops import compare_loaders
+
+BASE = """\
+# sesh config
+
+[default_session]
+startup_command = "ls"
+
+# ---
+
+[[session]]
+name = "1 dotfiles 💻"
+path = "~/dotfiles"
+windows = ["editor"]
+
+[[window]]
+name = "editor"
+startup_script = "win-editor-git"
+
+# ---
+
+[[session]]
+name = "51 api 🚀"
+path = "~/code/api" # keep me
+"""
+
+
+@pytest.fixture
+def sesh(tmp_path):
+    path = tmp_path / "sesh.toml"
+    path.write_text(BASE)
+    return path
+
+
+def test_add_appends_block_with_quick_windows(sesh):
+    with transaction(sesh) as tx:
+        assert tx.add("web", "~/code/web", "📦", 52)
+    assert sesh.read_text() == BASE + (
+        "\n"
+        "# ---\n"
+        "\n"
+        "[[session]]\n"
+        'name = "52 web 📦"\n'
+        'path = "~/code/web"\n'
+        "windows = ['editor']\n"
+        "\n"
+        "[[window]]\n"
+        'name = "editor"\n'
+        'startup_script = "win-editor-git"\n'
+    )
+
+
+def test_add_existing_name_is_refused(sesh):
+    with transaction(sesh) as tx:
+        assert not tx.add("api", "~/elsewhere", "🚀", 51)
+        assert not tx.dirty
+    assert sesh.read_text() == BASE
+
+
+def test_delete_removes_session_and_owned_windows(sesh):
+    with transaction(sesh) as tx:
+        assert tx.delete("1 dotfiles 💻")
+        assert not tx.delete("missing")
+    assert sesh.read_text() == """\
+# sesh config
+
+[default_session]
+startup_command = "ls"
+
+# ---
+
+[[session]]
+name = "51 api 🚀"
+path = "~/code/api" # keep me
+"""
+
+
+def test_delete_last_session_leaves_no_trailing_separator(sesh):
+    with transaction(sesh) as tx:
+        tx.delete("51 api 🚀")
+    assert sesh.read_text() == """\
+# sesh config
+
+[default_session]
+startup_command = "ls"
+
+# ---
+
+[[session]]
+name = "1 dotfiles 💻"
+path = "~/dotfiles"
+windows = ["editor"]
+
+[[window]]
+name = "editor"
+startup_script = "win-editor-git"
+"""
+
+
+def test_rename_rewrites_only_the_name_line(sesh):
+    with transaction(sesh) as tx:
+        assert tx.rename("51 api 🚀", '51 "api" 🚀')
+        assert not tx.rename("1 dotfiles 💻", '51 "api" 🚀')
+    assert sesh.read_text() == BASE.replace(
+        'name = "51 api 🚀"', 'name = "51 \\"api\\" 🚀"'
+    )
+
+
+def test_queued_operations_compose(sesh):
+    with transaction(sesh) as tx:
+        tx.add("web", "~/code/web", "📦", 52)
+        tx.rename("52 web 📦", "52 site 📦")
+        tx.delete("1 dotfiles 💻")
+        tx.delete("51 api 🚀")
+    assert sesh.read_text() == """\
+# sesh config
+
+[default_session]
+startup_command = "ls"
+
+# ---
+
+[[session]]
+name = "52 site 📦"
+path = "~/code/web"
+windows = ['editor']
+
+[[window]]
+name = "editor"
+startup_script = "win-editor-git"
+"""
+
+
+def test_add_to_missing_file(tmp_path):
+    path = tmp_path / "sesh.toml"
+    with transaction(path) as tx:
+        tx.add("web", "~/code/web", "📦", 52)
+    assert path.read_text().startswith('# ---\n\n[[session]]\nname = "52 web 📦"\n')
+
+
+def test_untouched_transaction_does_not_write(sesh):
+    before = sesh.stat().st_mtime_ns
+    with transaction(sesh):
+        pass
+    assert sesh.stat().st_mtime_ns == before
+
+
+@pytest.mark.parametrize("n", [1, 50, 500])
+def test_compare_loaders_agree_on_generated_fixture(n):
+    assert compare_loaders(generate(n)) == []
+
@@ -0,0 +1,56 @@
+"""plan_sessions dedupe rules against the session index."""
+
+import pytest
+
+from seshy.toml_ops import SESH_TOML_PATH
+from seshy.workflows.importer import plan_sessions
+
+
+@pytest.fixture(autouse=True)
+def sesh():
+    SESH_TOML_PATH.parent.mkdir(parents=True, exist_ok=True)
+    SESH_TOML_PATH.write_text(
+        '[[session]]\nname = "51 main 💻"\npath = "~/code/a"\n\n'
+        '[[session]]\nname = "52 api 💻"\npath = "~/code/api"\n'
+    )
+    yield
+    SESH_TOML_PATH.unlink()
+
+
+def _names(sessions):
+    return [(name, path) for name, path, _, _ in sessions]
+
+
+def test_same_branch_name_in_another_repo_is_added():
+    sessions, skipped = plan_sessions(
+        [("main", "~/code/a"), ("main", "~/code/b")], "💻", 53,
+        unique_names=False, unique_paths=False,
+    )
+    assert _names(sessions) == [("main", "~/code/b")]
+    assert skipped == [("main", "~/code/a")]
+
+
+def test_branches_sharing_a_repo_root_are_all_added():
+    sessions, _ = plan_sessions(
+        [("stack/part-1", "~/code/a"), ("stack/part-2", "~/code/a")], "💻", 53,
+        unique_names=False, unique_paths=False,
+    )
+    assert [s[3] for s in sessions] == [53, 54]
+
+
+def test_worktrees_dedupe_by_path():
+    sessions, skipped = plan_sessions(
+        [("feat", "~/code/api"), ("main", "~/code/wt")], "💻", 53,
+        unique_names=False,
+    )
+    assert _names(sessions) == [("main", "~/code/wt")]
+    assert skipped == [("feat", "~/code/api")]
+
+
+def test_import_dedupes_by_name_or_path():
+    sessions, skipped = plan_sessions(
+        [("api", "~/other/api"), ("x", "~/code/a"), ("new", "~/code/new")],
+        "💻", 53,
+    )
+    assert _names(sessions) == [("new", "~/code/new")]
+    assert len(skipped) == 2
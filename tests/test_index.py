@@ -0,0 +1,31 @@
+"""Index lookups by name and number."""
+
+import pytest
+
+from seshy import index
+from seshy.toml_ops import SESH_TOML_PATH
+
+
+@pytest.fixture(autouse=True)
+def sesh():
+    SESH_TOML_PATH.parent.mkdir(parents=True, exist_ok=True)
+    SESH_TOML_PATH.write_text(
+        '[[session]]\nname = "51 api 💻"\npath = "~/api"\n\n'
+        '[[session]]\nname = "51 web 💻"\npath = "~/web"\n'
+    )
+    yield
+    SESH_TOML_PATH.unlink()
+
+
+def test_find_entry_by_name_or_number():
+    assert index.find_entry(name="51 web 💻").start_line == 5
+    assert index.find_entry(number=51).name == "51 api 💻"
+    assert index.find_entry(name="missing") is None
+    assert index.find_entry(number=9) is None
+
+
+def test_lookup_is_reused_until_content_changes():
+    first = index.load_lookup()
+    assert index.load_lookup() is first
+    SESH_TOML_PATH.write_text('[[session]]\nname = "52 x 💻"\npath = "~"\n')
+    assert list(index.load_lookup().by_name) == ["52 x 💻"]
@@ -0,0 +1,31 @@
+"""ls records map sesh.toml spans back to sesh.d/ shard files."""
+
+import shutil
+
+import pytest
+
+from seshy.shards import SHARD_DIR
+from seshy.toml_ops import SESH_TOML_PATH
+from seshy.workflows.listing import records
+
+
+@pytest.fixture
+def shards():
+    SHARD_DIR.mkdir(parents=True)
+    (SHARD_DIR / "personal.toml").write_text(
+        '[[session]]\nname = "1 a"\npath = "~"\n'
+    )
+    (SHARD_DIR / "work.toml").write_text(
+        '# work\n[[session]]\nname = "2 b"\npath = "~"\n# trailing note\n'
+    )
+    yield
+    shutil.rmtree(SHARD_DIR)
+    SESH_TOML_PATH.unlink()
+
+
+def test_spans_stay_inside_their_shard(shards):
+    got = [(r["file"], r["line"], r["end_line"]) for r in records(["1 a", "2 b"])]
+    assert got == [
+        (str(SHARD_DIR / "personal.toml"), 1, 3),
+        (str(SHARD_DIR / "work.toml"), 2, 4),
+    ]
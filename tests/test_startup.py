@@ -0,0 +1,83 @@
+"""Startup stage planning and the launch scheduler, with a fake launcher."""
+
+import threading
+
+from seshy.config import Config
+from seshy.workflows.startup import launch_sessions, plan_stages
+
+STAGES = Config.from_dict({
+    "startup": {
+        "stages": [
+            {"sessions": ["bg*"], "wait": False},
+            {"sessions": ["a*"]},
+            {"sessions": ["b*"]},
+        ]
+    }
+}).startup_stages
+
+# Input order as `run` passes it: most used first, not sesh.toml order
+SESSIONS = ["bg1", "b1", "z1", "a1", "a2", "bg2"]
+
+
+class FakeLauncher:
+    """Records ("start"/"end", session) events; fails sessions in `fail`."""
+
+    def __init__(self, fail: frozenset[str] = frozenset()) -> None:
+        self.events: list[tuple[str, str]] = []
+        self.fail = fail
+        self._lock = threading.Lock()
+
+    def __call__(self, name: str, timeout: float | None) -> bool:
+        with self._lock:
+            self.events.append(("start", name))
+        with self._lock:
+            self.events.append(("end", name))
+        return name not in self.fail
+
+    def starts(self) -> list[str]:
+        return [name for event, name in self.events if event == "start"]
+
+    def index(self, event: str, name: str) -> int:
+        return self.events.index((event, name))
+
+
+def test_plan_stages_keeps_input_order_and_puts_unmatched_last():
+    plan = plan_stages(SESSIONS, STAGES)
+    assert [(st.patterns if st else None, s) for st, s in plan] == [
+        (("bg*",), ["bg1", "bg2"]),
+        (("a*",), ["a1", "a2"]),
+        (("b*",), ["b1"]),
+        (None, ["z1"]),
+    ]
+
+
+def test_plan_stages_drops_empty_stages():
+    plan = plan_stages(["z1", "a1"], STAGES)
+    assert [s for _, s in plan] == [["a1"], ["z1"]]
+
+
+def test_background_stage_listed_first_does_not_starve_later_stages():
+    launcher = FakeLauncher()
+    launched, failed, _ = launch_sessions(
+        plan_stages(SESSIONS, STAGES), 1, None, launcher
+    )
+    assert launcher.starts() == ["a1", "a2", "b1", "z1", "bg1", "bg2"]
+    assert launched == ["bg1", "bg2", "a1", "a2", "b1", "z1"]
+    assert failed == []
+
+
+def test_waited_stages_and_final_stage_run_in_order():
+    launcher = FakeLauncher()
+    launch_sessions(plan_stages(SESSIONS, STAGES), 4, None, launcher)
+    at = launcher.index
+    assert at("start", "b1") > max(at("end", "a1"), at("end", "a2"))
+    assert at("start", "z1") > at("end", "b1")
+    assert sorted(launcher.starts()) == sorted(SESSIONS)
+
+
+def test_failed_session_still_releases_the_next_stage():
+    launcher = FakeLauncher(fail=frozenset({"a1"}))
+    launched, failed, _ = launch_sessions(
+        plan_stages(["a1", "b1"], STAGES), 2, None, launcher
+    )
+    assert launched == ["b1"] and failed == ["a1"]
@@ -0,0 +1,38 @@
+"""add_sessions: refused duplicates and numbers re-checked under the lock."""
+
+import pytest
+
+from seshy.toml_ops import SESH_TOML_PATH, add_session, add_sessions, list_sessions
+
+
+@pytest.fixture(autouse=True)
+def sesh():
+    SESH_TOML_PATH.parent.mkdir(parents=True, exist_ok=True)
+    SESH_TOML_PATH.write_text('[[session]]\nname = "51 api 💻"\npath = "~/api"\n')
+    yield
+    SESH_TOML_PATH.unlink()
+
+
+def test_existing_full_name_is_not_written_or_reported():
+    assert add_session("x2", "~/x", "💻", 5) == 5
+    before = SESH_TOML_PATH.read_text()
+    assert add_session("x2", "~/x", "💻", 5) is None
+    assert SESH_TOML_PATH.read_text() == before
+
+
+def test_numbers_taken_since_planning_are_reallocated():
+    # Both planned 52 before either took the lock
+    assert add_session("web", "~/web", "💻", 52, renumber=True) == 52
+    added = add_sessions(
+        [("cli", "~/cli", "💻", 52), ("docs", "~/docs", "💻", 53)], renumber=True
+    )
+    assert [number for *_, number in added] == [53, 54]
+    assert list_sessions() == [
+        "51 api 💻", "52 web 💻", "53 cli 💻", "54 docs 💻",
+    ]
+
+
+def test_explicit_numbers_are_kept_without_renumber():
+    assert add_sessions([("web", "~/web", "💻", 51)]) == [
+        ("web", "~/web", "💻", 51)
+    ]
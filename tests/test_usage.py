@@ -0,0 +1,32 @@
+"""The frecency cache is best effort: a malformed one is rebuilt, not fatal."""
+
+import json
+
+import pytest
+
+from seshy import usage
+
+
+@pytest.fixture(autouse=True)
+def clean():
+    yield
+    usage.USAGE_LOG.unlink(missing_ok=True)
+    usage.FRECENCY_PATH.unlink(missing_ok=True)
+
+
+@pytest.mark.parametrize(
+    "corrupt",
+    [
+        lambda c: {"version": c["version"]},  # current version, keys missing
+        lambda c: {**c, "scores": {"a": "x"}},  # wrong value inside scores
+        lambda c: {**c, "order": None},
+        lambda c: {**c, "offset": "0"},
+    ],
+)
+def test_malformed_cache_is_rebuilt_from_the_log(corrupt):
+    usage.record(["b", "b", "b", "a"], "select")
+    cache = json.loads(usage.FRECENCY_PATH.read_text())
+    usage.FRECENCY_PATH.write_text(json.dumps(corrupt(cache)))
+
+    usage.record(["a"], "select")  # must not raise
+    assert usage.sort_by_frecency(["a", "c", "b"]) == ["b", "a", "c"]